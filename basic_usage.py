@@ -8,15 +8,15 @@ wave = wsig.read("example/example.pr1")
 print("Type of measure: " + str(wave.getparaname()))  # type of measure
 print(wave.getparams())
 
-# Read frames as numpy array
-signal = np.frombuffer(wave.readframes(-1), np.int16)
+# Map frames as numpy array (no copy)
+signal = wave.asarray()[:, 0]
 
 # Calibration
 # =============
 # double val_calib = (double)(valint16 - czero) * (m_fValueAtMax / m_fSignalDynamic)
 # =============
 if wave._filetype == b'WSIG':
-    calibratedSignal = (signal - wave.getzero()) * (wave.getvalueatmax() / wave.getsignaldynamic())
+    calibratedSignal = wave.readcalibrated(-1)[:, 0]
 else:
     print("Not WSIG File, no calibration needed")
 
@@ -0,0 +1,199 @@
+import wsig
+import conversion
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import numpy as np
+
+
+def make_wsig(filename, rate=2000, nframes=43708, nchannels=1, sampwidth=2,
+              paraname="synthetic pressure", unit="hPa", metainfo="synthetic recording",
+              seed=0, blocksize=1 << 20):
+    """Write a valid synthetic WSIG file (sdsc, adsc, data and LIST chunks)
+
+    The signal is a slow sinusoid plus noise, written block by block so
+    that multi-GB files can be generated in bounded memory.
+    """
+    dtype = np.dtype({1: 'u1', 2: '<i2', 4: '<i4'}[sampwidth])
+    s_max = np.iinfo(np.int16).max if sampwidth > 1 else 255
+    text = metainfo.encode('ascii') + b'\x00'
+    if len(text) & 1:
+        text += b'\x00'
+    info = b'INFO' + b'ICMT' + struct.pack('<L', len(text)) + text
+
+    sdsc = dict(acronym=struct.unpack('<L', b'syn ')[0], paraname=paraname, unitname=unit,
+                s_max=s_max, s_min=0 if sampwidth == 1 else -s_max - 1,
+                cmax=2048, czero=0, imax=20, fmax=0)
+    adsc = dict(highest=s_max, lowest=0 if sampwidth == 1 else -s_max - 1, reccode=4)
+    with wsig.WsigWriter(filename, rate, nchannels, sampwidth, nframes, sdsc, adsc, info) as f:
+        rng = np.random.RandomState(seed)
+        amplitude = 0.4 * s_max
+        for start in range(0, nframes, blocksize):
+            n = min(blocksize, nframes - start)
+            t = np.arange(start, start + n) / float(rate)
+            signal = amplitude * np.sin(2 * np.pi * 0.5 * t)[:, None] \
+                + rng.normal(0, 0.01 * s_max, (n, nchannels))
+            if sampwidth == 1:
+                signal = signal / 2 + 128
+            f.writeframes(signal.astype(dtype))
+
+
+def parse_size(text):
+    """'64K', '10M', '2G' -> number of bytes"""
+    m = re.match(r'^(\d+(?:\.\d+)?)([KMG]?)B?$', text.upper())
+    if not m:
+        raise argparse.ArgumentTypeError("invalid size: " + text)
+    return int(float(m.group(1)) * 1024 ** ' KMG'.index(m.group(2) or ' '))
+
+
+def timeit(func, repeat):
+    """Best wall time of repeat calls to func()"""
+    best = float('inf')
+    for i in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def read_all(filename, blocksize):
+    with wsig.read(filename) as wave:
+        if blocksize < 0:
+            wave.readframes(-1)
+        else:
+            while wave.readframes(blocksize):
+                pass
+
+
+def calibrate_all(filename, blocksize):
+    with wsig.read(filename) as wave:
+        for block in wave.iterblocks(blocksize, calibrated=True):
+            pass
+
+
+def calibrate_whole(filename):
+    with wsig.read(filename) as wave:
+        signal = np.frombuffer(wave.readframes(-1), np.int16)
+        (signal - wave.getzero()) * (wave.getvalueatmax() / wave.getsignaldynamic())
+
+
+def towave_all(filename, output):
+    with wsig.read(filename) as wave:
+        signal = np.frombuffer(wave.readframes(-1), np.int16)
+        wsig.towave(output, wave.getframerate(), signal)
+
+
+def benchmark(sizes, workdir, repeat=3, blocksizes=(1024, 65536, 1 << 20, -1), jobs=2, nfiles=8):
+    """Run all the benchmarks on synthetic files of the given data sizes
+    (in bytes) and return the list of results"""
+    results = []
+
+    def record(name, size, seconds, **params):
+        result = {'benchmark': name, 'size': size, 'params': params, 'seconds': seconds,
+                  'MBps': size / seconds / 1e6 if seconds else None}
+        results.append(result)
+        print("%-16s %10d bytes %-32s %10.6f s" % (name, size, json.dumps(params), seconds))
+
+    for size in sizes:
+        filename = os.path.join(workdir, "bench_%d.pr1" % size)
+        make_wsig(filename, nframes=max(1, size // 2))
+
+        record('header', size, timeit(lambda: wsig.read(filename).close(), max(repeat, 100)),
+               repeat=max(repeat, 100))
+        for blocksize in blocksizes:
+            record('readframes', size, timeit(lambda: read_all(filename, blocksize), repeat),
+                   blocksize=blocksize)
+        record('calibration', size, timeit(lambda: calibrate_all(filename, 65536), repeat),
+               blocksize=65536)
+        record('calibration', size, timeit(lambda: calibrate_whole(filename), repeat),
+               blocksize=-1)
+        output = os.path.join(workdir, "bench.wav")
+        record('towave', size, timeit(lambda: towave_all(filename, output), repeat))
+        os.remove(output)
+
+        indir = os.path.join(workdir, "in")
+        outdir = os.path.join(workdir, "out")
+        os.makedirs(indir)
+        for i in range(nfiles):
+            os.link(filename, os.path.join(indir, "file%d.pr1" % i))
+        inputs = [os.path.join(indir, "file%d.pr1" % i) for i in range(nfiles)]
+        outputs = [os.path.join(outdir, "file%d.pr1.wav" % i) for i in range(nfiles)]
+        for j in (1, jobs):
+            def run():
+                shutil.rmtree(outdir, ignore_errors=True)
+                os.makedirs(outdir)
+                conversion.conversion(inputs, outputs, j)
+            stdout, sys.stdout = sys.stdout, open(os.devnull, 'w')
+            try:
+                seconds = timeit(run, repeat)
+            finally:
+                sys.stdout.close()
+                sys.stdout = stdout
+            record('conversion', size * nfiles, seconds, files=nfiles, jobs=j)
+        shutil.rmtree(indir)
+        shutil.rmtree(outdir)
+        os.remove(filename)
+    return results
+
+
+def compare(results, reference):
+    """Print the time ratio of each result to the same benchmark in reference"""
+    def key(r):
+        return r['benchmark'], r['size'], json.dumps(r['params'], sort_keys=True)
+    previous = {key(r): r for r in reference['results']}
+    print("\nCompared to wsig " + reference['wsig'] + ":")
+    for r in results:
+        old = previous.get(key(r))
+        if old and old['seconds']:
+            print("%-16s %10d bytes %-32s x%.2f" % (r['benchmark'], r['size'],
+                                                   json.dumps(r['params']), r['seconds'] / old['seconds']))
+
+
+if __name__ == '__main__':
+    # Parse command line arguments.
+    parser = argparse.ArgumentParser(description='Benchmark of the wsig module on synthetic files',
+                                     add_help=True, usage='%(prog)s [options]')
+    parser.add_argument(
+        '-o', '--output', metavar='FILE', dest='output', default='bench_output.json',
+        help="JSON file where results are saved")
+    parser.add_argument(
+        '-s', '--sizes', nargs='+', type=parse_size, metavar='SIZE', dest='sizes',
+        default=[parse_size(s) for s in ('64K', '4M', '64M')],
+        help="sizes of the data chunks, e.g. 64K 16M 2G")
+    parser.add_argument(
+        '-r', '--repeat', type=int, default=3, metavar='N', dest='repeat',
+        help="number of runs of each benchmark (the best is kept)")
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=2, metavar='N', dest='jobs',
+        help="number of processes for the parallel conversion benchmark")
+    parser.add_argument(
+        '-w', '--workdir', metavar='DIR', dest='workdir', default=None,
+        help="directory for the synthetic files (default: a temporary directory)")
+    parser.add_argument(
+        '-c', '--compare', metavar='FILE', dest='compare', default=None,
+        help="JSON results of a previous run to compare with")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(dir=args.workdir)
+    try:
+        results = benchmark(args.sizes, workdir, args.repeat, jobs=args.jobs)
+    finally:
+        shutil.rmtree(workdir)
+
+    report = {'wsig': wsig.__version__, 'python': platform.python_version(),
+              'numpy': np.__version__, 'platform': platform.platform(),
+              'date': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=1)
+    print("Results saved in " + args.output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
@@ -1,20 +1,115 @@
 import wsig
 import argparse
+import concurrent.futures
+import hashlib
+import json
 import sys
 import os
 import re
-import numpy as np
 
+MANIFEST = ".conversion_manifest.json"
 
-def conversion(input, output):
-    nfiles = len(input)
-    for i in range(nfiles):
-        print("Start conversion for " + input[i] + "...")
-        wave = wsig.read(input[i])
-        # Read frames as numpy array
-        signal = np.frombuffer(wave.readframes(-1), np.int16)
-        wsig.towave(output[i], wave.getframerate(), signal)
-        print("Done. (" + output[i] + ")")
+
+def convert(input, output, blocksize=1 << 16):
+    # Stream blocks of frames to the .wav, the signal is never fully loaded
+    with wsig.read(input) as wave, \
+            wsig.WaveWriter(output, wave.getframerate(), wave.getnchannels(),
+                            nframes=wave.getnframes(), sampwidth=wave.getsampwith()) as wav:
+        for block in wave.iterblocks(blocksize):
+            wav.writeframes(block)
+    return output
+
+
+def checksum(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def unchanged(input, output, entry, use_checksum):
+    """Compare an input file with its manifest entry (updated in place
+    when only the mtime changed but the checksum still matches)"""
+    if entry is None or entry['output'] != output or not os.path.exists(output):
+        return False
+    st = os.stat(input)
+    if entry['size'] != st.st_size:
+        return False
+    if entry['mtime'] == st.st_mtime_ns:
+        return True
+    if use_checksum and entry.get('sha1') == checksum(input):
+        entry['mtime'] = st.st_mtime_ns
+        return True
+    return False
+
+
+def conversion(input, output, jobs=1, manifest=None, use_checksum=False):
+    """Convert input[i] to output[i] with jobs processes. The outputs
+    must be distinct files.
+
+    If manifest is the path of a JSON file, inputs whose size and mtime
+    (or, with use_checksum, content) did not change since the last run
+    are skipped. Errors are reported without stopping the batch; the
+    list of inputs that failed is returned.
+    """
+    seen = set()
+    for dst in output:
+        path = os.path.normcase(os.path.abspath(dst))
+        if path in seen:
+            raise ValueError("several inputs are converted to " + dst)
+        seen.add(path)
+
+    entries = {}
+    if manifest is not None and os.path.exists(manifest):
+        with open(manifest) as f:
+            entries = json.load(f)
+
+    todo = []
+    for src, dst in zip(input, output):
+        key = os.path.abspath(src)
+        if manifest is not None and unchanged(src, dst, entries.get(key), use_checksum):
+            print("Unchanged, skip " + src)
+        else:
+            entries.pop(key, None)
+            todo.append((src, dst))
+
+    failed = []
+
+    def done(src, dst, error):
+        if error is not None:
+            print("Failed conversion for " + src + ": " + (str(error) or type(error).__name__),
+                  file=sys.stderr)
+            failed.append(src)
+            return
+        print("Done. (" + dst + ")")
+        st = os.stat(src)
+        entry = {'output': dst, 'size': st.st_size, 'mtime': st.st_mtime_ns}
+        if use_checksum:
+            entry['sha1'] = checksum(src)
+        entries[os.path.abspath(src)] = entry
+
+    try:
+        if jobs == 1:
+            for src, dst in todo:
+                print("Start conversion for " + src + "...")
+                try:
+                    convert(src, dst)
+                except Exception as e:
+                    done(src, dst, e)
+                else:
+                    done(src, dst, None)
+        else:
+            with concurrent.futures.ProcessPoolExecutor(jobs) as executor:
+                futures = {executor.submit(convert, src, dst): (src, dst) for src, dst in todo}
+                for future in concurrent.futures.as_completed(futures):
+                    src, dst = futures[future]
+                    done(src, dst, future.exception())
+    finally:
+        if manifest is not None:
+            with open(manifest, 'w') as f:
+                json.dump(entries, f, indent=1)
+    return failed
 
 
 if __name__ == '__main__':
@@ -27,6 +122,16 @@ if __name__ == '__main__':
     parser.add_argument(
         '-o, --output', nargs=None, metavar='STR', dest='output',
         help="output directory for files after conversion")
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1, metavar='N', dest='jobs',
+        help="number of conversion processes (0: one per CPU)")
+    parser.add_argument(
+        '--incremental', action='store_true', dest='incremental',
+        help="skip files unchanged (size and mtime) since the last run, "
+             "using a manifest in the output directory")
+    parser.add_argument(
+        '--checksum', action='store_true', dest='checksum',
+        help="with --incremental, compare contents (SHA-1) when the mtime changed")
 
     if len(sys.argv) == 1:
             parser.print_help()
@@ -44,12 +149,22 @@ if __name__ == '__main__':
     output_list = []
     regex = re.compile(r'.+\.(int|naf|oaf|pr1|pr2)$')
     for path, subdirs, files in os.walk(input_dir):
+        # same subdirectory in the output directory: recordings of the
+        # same name in different subdirectories do not overwrite each other
+        output_dir = os.path.normpath(os.path.join(args.output, os.path.relpath(path, input_dir)))
         for name in files:
             if re.match(regex, name):
+                if not os.path.exists(output_dir):
+                    os.makedirs(output_dir)
                 files_list.append(os.path.join(path, name))
-                output_list.append(os.path.join(args.output, name+".wav"))
+                output_list.append(os.path.join(output_dir, name+".wav"))
             else:
                 pass
 
     if files_list is not None:
-        conversion(files_list, output_list)
+        manifest = os.path.join(args.output, MANIFEST) if args.incremental else None
+        failed = conversion(files_list, output_list, args.jobs or os.cpu_count(),
+                            manifest, args.checksum)
+        if failed:
+            print(str(len(failed)) + " file(s) failed", file=sys.stderr)
+            sys.exit(1)
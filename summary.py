@@ -0,0 +1,89 @@
+import wsig
+import argparse
+import concurrent.futures
+import csv
+import json
+import sys
+import os
+import re
+
+PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+
+
+def statistics(input, calibrated=True):
+    """Return one row of statistics per channel of the file input"""
+    with wsig.read(input) as wave:
+        summary = wave.stats(calibrated).summary(PERCENTILES)
+        rows = []
+        for ch in range(wave.getnchannels()):
+            row = {'path': input, 'channel': ch, 'paraname': wave.getparaname(),
+                   'unit': wave.getunit() if calibrated else '', 'framerate': wave.getframerate(),
+                   'duration': wave.getduration()}
+            row.update((name, values[ch]) for name, values in summary.items())
+            rows.append(row)
+    return rows
+
+
+def summarize(input, output, jobs=1, calibrated=True):
+    """Compute the statistics of the files input with jobs processes and
+    write them to output (CSV, or JSON if output ends with .json).
+    Errors are reported without stopping the batch; the list of inputs
+    that failed is returned."""
+    rows = []
+    failed = []
+    with concurrent.futures.ProcessPoolExecutor(jobs) as executor:
+        futures = {executor.submit(statistics, path, calibrated): path for path in input}
+        for future in concurrent.futures.as_completed(futures):
+            path = futures[future]
+            try:
+                rows.extend(future.result())
+            except Exception as e:
+                print("Failed statistics for " + path + ": " + (str(e) or type(e).__name__),
+                      file=sys.stderr)
+                failed.append(path)
+    rows.sort(key=lambda row: (row['path'], row['channel']))
+
+    with open(output, 'w', newline='') as f:
+        if output.endswith('.json'):
+            json.dump(rows, f, indent=1)
+        elif rows:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    return failed
+
+
+if __name__ == '__main__':
+    # Parse command line arguments.
+    parser = argparse.ArgumentParser(description='Statistics of all the recordings of a directory',
+                                     add_help=True, usage='%(prog)s [options]')
+    parser.add_argument(
+        '-i', '--input', metavar='DIR', dest='input',
+        help='input directory containing the recordings')
+    parser.add_argument(
+        '-o', '--output', metavar='FILE', dest='output', default='summary.csv',
+        help="output file (CSV, or JSON if it ends with .json)")
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=0, metavar='N', dest='jobs',
+        help="number of processes (default 0: one per CPU)")
+    parser.add_argument(
+        '--raw', action='store_true', dest='raw',
+        help="statistics of the raw samples instead of the calibrated values")
+
+    if len(sys.argv) == 1:
+        parser.print_help()
+        sys.exit(1)
+    args = parser.parse_args()
+
+    files_list = []
+    regex = re.compile(r'.+\.(int|naf|oaf|pr1|pr2|wav)$')
+    for path, subdirs, files in os.walk(args.input):
+        for name in files:
+            if re.match(regex, name):
+                files_list.append(os.path.join(path, name))
+
+    failed = summarize(files_list, args.output, args.jobs or os.cpu_count(), not args.raw)
+    print("Statistics of " + str(len(files_list) - len(failed)) + " file(s) written to " + args.output)
+    if failed:
+        print(str(len(failed)) + " file(s) failed", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,40 @@
+import asyncio
+import os
+import unittest
+
+import numpy as np
+
+import wsig
+import wsig.aio
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       'example', 'example')
+
+
+class AioTest(unittest.TestCase):
+
+    def test_read(self):
+        with wsig.read(EXAMPLE + '.pr1') as w:
+            frames = np.array(w.asarray())
+            metainfo = w.getmetainfo()
+
+        async def read():
+            async with await wsig.aio.open(EXAMPLE + '.pr1') as f:
+                blocks = [f.readframes(1000)]
+                # the LIST chunk after the frames is read in the pool,
+                # serialized with the frame reads
+                metadata = [f.getmetainfo()]
+                blocks.append(f.readframes(1000))
+                at = f.read_at(40000, 50)
+                results = await asyncio.gather(*blocks, *metadata, at)
+            return results
+
+        first, second, info, at = asyncio.run(read())
+        self.assertEqual(info, metainfo)
+        data = np.frombuffer(first + second, np.int16).reshape(-1, 1)
+        np.testing.assert_array_equal(data, frames[:2000])
+        np.testing.assert_array_equal(at, frames[40000:40050])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import io
+import os
+import struct
+import unittest
+
+import numpy as np
+
+import wsig
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       'example', 'example')
+
+
+def chunks(data):
+    # (name, body) of the chunks of a RIFF file
+    pos = 12
+    while pos + 8 <= len(data):
+        name, size = struct.unpack_from('<4sL', data, pos)
+        yield name, data[pos + 8:pos + 8 + size]
+        pos += 8 + size + (size & 1)
+
+
+def riff(filetype, *chunks):
+    body = b''.join(name + struct.pack('<L', len(data)) + data + b'\x00' * (len(data) & 1)
+                    for name, data in chunks)
+    return b'RIFF' + struct.pack('<L', 4 + len(body)) + filetype + body
+
+
+class Unseekable(io.RawIOBase):
+    # stream without tell() and seek(), as a pipe
+
+    def __init__(self, data):
+        self._stream = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        return self._stream.readinto(b)
+
+    def seekable(self):
+        return False
+
+    def tell(self):
+        raise OSError('not seekable')
+
+    def seek(self, *args):
+        raise OSError('not seekable')
+
+
+class HeaderTest(unittest.TestCase):
+
+    def setUp(self):
+        with open(EXAMPLE + '.pr1', 'rb') as f:
+            self.data = f.read()
+        self.chunks = dict(chunks(self.data))
+        self.frames = np.frombuffer(self.chunks[b'data'], '<i2').reshape(-1, 1)
+        with wsig.read(EXAMPLE + '.pr1') as w:
+            self.params = w.getparams()
+
+    def check(self, w, listdata=True):
+        self.assertEqual(w.getparams(), self.params)
+        if listdata:
+            self.assertEqual(w.getlistdata(), self.chunks[b'LIST'])
+        np.testing.assert_array_equal(w._frombuffer(w.readframes(-1)), self.frames)
+
+    def test_example(self):
+        self.check(wsig.read(io.BytesIO(self.data)))
+
+    def test_unseekable(self):
+        # the first frames are read with the header and kept in _pending
+        w = wsig.read(Unseekable(self.data))
+        self.assertIsNone(w._data_offset)
+        self.assertTrue(w._pending)
+        np.testing.assert_array_equal(w._frombuffer(w.readframes(10)), self.frames[:10])
+        np.testing.assert_array_equal(w._frombuffer(w.readframes(-1)), self.frames[10:])
+        self.assertRaises(wsig.Error, w.setpos, 1 << 30)
+        w.setpos(0)
+        self.assertRaises(wsig.Error, w.readframes, 10)
+
+    def test_large_chunk_before_data(self):
+        c = self.chunks
+        for size in (5000, 3 * 4096 + 1, 1 << 20):
+            junk = (b'junk', bytes(range(256)) * (size // 256) + b'\x01' * (size % 256))
+            data = riff(b'WSIG', (b'sdsc', c[b'sdsc']), junk, (b'adsc', c[b'adsc']), junk,
+                        (b'data', c[b'data']), (b'LIST', c[b'LIST']))
+            self.check(wsig.read(io.BytesIO(data)))
+            self.check(wsig.read(Unseekable(data)), listdata=False)
+
+    def test_list_before_data(self):
+        c = self.chunks
+        data = riff(b'WSIG', (b'sdsc', c[b'sdsc']), (b'adsc', c[b'adsc']),
+                    (b'LIST', c[b'LIST']), (b'data', c[b'data']))
+        w = wsig.read(io.BytesIO(data))
+        self.assertEqual(w.getmetainfo(), wsig.read(EXAMPLE + '.pr1').getmetainfo())
+        self.check(w)
+
+    def test_offset(self):
+        # the RIFF file starts in the middle of another file
+        prefix = b'\xff' * 1001
+        f = io.BytesIO(prefix + self.data + b'trailing bytes')
+        f.seek(len(prefix))
+        w = wsig.read(f)
+        self.assertEqual(w._data_offset, len(prefix) + 196)
+        self.check(w)
+        np.testing.assert_array_equal(w.read_at(100, 10), self.frames[100:110])
+        w.setpos(20000)
+        np.testing.assert_array_equal(w._frombuffer(w.readframes(5)), self.frames[20000:20005])
+
+    def test_truncated(self):
+        for size in (0, 4):
+            self.assertRaises(EOFError, wsig.read, io.BytesIO(self.data[:size]))
+        # chunks missing
+        for size in (8, 12, 150, 190):
+            self.assertRaises(wsig.Error, wsig.read, io.BytesIO(self.data[:size]))
+        # sdsc chunk cut
+        for size in (20, 100):
+            self.assertRaises(EOFError, wsig.read, io.BytesIO(self.data[:size]))
+        self.assertRaises(wsig.Error, wsig.read, io.BytesIO(b'RIFX' + self.data[4:]))
+        self.assertRaises(wsig.Error, wsig.read, io.BytesIO(self.data[:8] + b'AVI ' +
+                                                            self.data[12:]))
+        # data chunk cut: the frames present are read
+        w = wsig.read(io.BytesIO(self.data[:10001]))
+        np.testing.assert_array_equal(w._frombuffer(w.readframes(-1)),
+                                      self.frames[:(10001 - 196) // 2])
+
+    def test_missing_chunks(self):
+        c = self.chunks
+        self.assertRaises(wsig.Error, wsig.read, io.BytesIO(
+            riff(b'WSIG', (b'adsc', c[b'adsc']), (b'data', c[b'data']))))
+        self.assertRaises(wsig.Error, wsig.read, io.BytesIO(
+            riff(b'WSIG', (b'sdsc', c[b'sdsc']), (b'adsc', c[b'adsc']))))
+        self.assertRaises(wsig.Error, wsig.read, io.BytesIO(
+            riff(b'WAVE', (b'data', c[b'data']))))
+
+
+if __name__ == '__main__':
+    unittest.main()
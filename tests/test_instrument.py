@@ -0,0 +1,93 @@
+import io
+import os
+import threading
+import unittest
+
+import wsig
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       'example', 'example')
+
+
+class ToggleFile(io.BytesIO):
+    # file object switching the instrumentation at each read, as another
+    # thread entering or leaving instrument() would
+
+    def read(self, *args):
+        wsig._instrumented = not wsig._instrumented
+        return super().read(*args)
+
+
+class InstrumentTest(unittest.TestCase):
+
+    def setUp(self):
+        with open(EXAMPLE + '.pr1', 'rb') as f:
+            self.data = f.read()
+        self.addCleanup(setattr, wsig, '_instrumented', wsig._instrumented)
+
+    def test_counters(self):
+        wsig.resetiostats()
+        with wsig.instrument():
+            with wsig.read(EXAMPLE + '.pr1') as w:
+                w.readcalibrated(1000)
+                w.read_at(2000, 100)
+                stats = w.getiostats()
+        self.assertEqual(stats['headers'], 1)
+        self.assertEqual(stats['bytes_read'], wsig.getiostats()['bytes_read'])
+        self.assertGreaterEqual(stats['bytes_read'], 2200)
+        if not wsig._instrumented_env:
+            with wsig.read(EXAMPLE + '.pr1') as w:
+                w.readframes(-1)
+            self.assertEqual(wsig.getiostats()['headers'], 1)
+
+    def test_seeks(self):
+        with wsig.instrument():
+            with wsig.read(EXAMPLE + '.pr1') as w:
+                w.read_at(2000, 100)
+                self.assertEqual(w.getiostats()['seeks'], 0)
+                w.setpos(10)
+                w.readframes(10)
+                self.assertEqual(w.getiostats()['seeks'], 1)
+            # positional reads without file descriptor seek and seek back
+            w = wsig.read(io.BytesIO(self.data))
+            w.read_at(2000, 100)
+            self.assertEqual(w.getiostats()['seeks'], 2)
+
+    def test_toggled_during_call(self):
+        for instrumented in (False, True):
+            wsig._instrumented = instrumented
+            w = wsig.read(ToggleFile(self.data))
+            w.read_at(100, 10)
+            w.readcalibrated(10)
+            w.rewind()
+            w.readframes(10)
+
+    def test_overlapping_blocks(self):
+        entered = [threading.Event() for i in range(2)]
+        leave = [threading.Event() for i in range(2)]
+
+        def block(i):
+            with wsig.instrument():
+                entered[i].set()
+                leave[i].wait()
+
+        threads = [threading.Thread(target=block, args=(i,)) for i in range(2)]
+        for i in range(2):
+            threads[i].start()
+            entered[i].wait()
+        try:
+            self.assertTrue(wsig._instrumented)
+            leave[0].set()
+            threads[0].join()
+            # the block of the other thread is still running
+            self.assertTrue(wsig._instrumented)
+            with wsig.instrument(False):
+                self.assertTrue(wsig._instrumented)
+        finally:
+            leave[1].set()
+            threads[1].join()
+        self.assertEqual(wsig._instrumented, wsig._instrumented_env)
+
+
+if __name__ == '__main__':
+    unittest.main()
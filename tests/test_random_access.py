@@ -0,0 +1,159 @@
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+import numpy as np
+
+import wsig
+import wsig.loader
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       'example', 'example')
+
+
+class SlowFile(io.BytesIO):
+    # file object without file descriptor, which gives other threads the
+    # opportunity to run between its calls
+
+    def read(self, *args):
+        time.sleep(0.0002)
+        return super().read(*args)
+
+    def seek(self, *args):
+        time.sleep(0.0002)
+        return super().seek(*args)
+
+
+class RandomAccessTest(unittest.TestCase):
+
+    def setUp(self):
+        self.w = wsig.read(EXAMPLE + '.pr1')
+        self.addCleanup(self.w.close)
+        self.frames = np.array(self.w.asarray())
+        self.nframes = self.w.getnframes()
+        self.calibrated = ((self.frames - self.w.getzero()) * self.w._calibration_factor()
+                           ).astype(np.float32)
+
+    def test_read_range(self):
+        for start, stop in [(0, 10), (1000, 3000), (self.nframes - 5, self.nframes)]:
+            np.testing.assert_array_equal(self.w.read_range(start, stop),
+                                          self.frames[start:stop])
+            self.assertEqual(self.w.tell(), stop)
+
+    def test_read_range_clipped(self):
+        np.testing.assert_array_equal(self.w.read_range(-10, 5), self.frames[:5])
+        np.testing.assert_array_equal(self.w.read_range(self.nframes - 3, self.nframes + 100),
+                                      self.frames[-3:])
+        self.assertEqual(self.w.read_range(self.nframes + 1, self.nframes + 10).shape,
+                         (0, self.w.getnchannels()))
+        self.assertEqual(self.w.read_range(20, 10).shape, (0, self.w.getnchannels()))
+
+    def test_read_range_calibrated(self):
+        np.testing.assert_allclose(self.w.read_range(100, 900, calibrated=True),
+                                   self.calibrated[100:900], rtol=1e-6)
+        self.assertEqual(self.w.read_range(0, 10, True, np.float64).dtype, np.float64)
+
+    def test_read_time_range(self):
+        rate = self.w.getframerate()
+        np.testing.assert_array_equal(self.w.read_time_range(1.0, 2.5),
+                                      self.frames[rate:int(2.5 * rate)])
+        duration = self.nframes / float(rate)
+        np.testing.assert_array_equal(self.w.read_time_range(duration - 0.01, duration + 1.0),
+                                      self.frames[self.nframes - int(round(0.01 * rate)):])
+
+    def test_read_at(self):
+        self.w.setpos(123)
+        np.testing.assert_array_equal(self.w.read_at(500, 250), self.frames[500:750])
+        np.testing.assert_array_equal(self.w.read_at(self.nframes - 4, 100), self.frames[-4:])
+        np.testing.assert_array_equal(self.w.read_at(-5, 3), self.frames[:3])
+        np.testing.assert_array_equal(self.w.read_at(40000, -1), self.frames[40000:])
+        np.testing.assert_allclose(self.w.read_at(7, 11, calibrated=True),
+                                   self.calibrated[7:18], rtol=1e-6)
+        # the position of readframes() is unchanged
+        self.assertEqual(self.w.tell(), 123)
+
+    def test_read_at_threads(self):
+        with open(EXAMPLE + '.pr1', 'rb') as f:
+            w = wsig.read(SlowFile(f.read()))
+        self.assertIsNone(w._fileno)
+        errors = []
+        done = threading.Event()
+
+        def read_at():
+            while not done.is_set():
+                if not np.array_equal(w.read_at(40000, 50), self.frames[40000:40050]):
+                    errors.append('read_at')
+
+        thread = threading.Thread(target=read_at)
+        thread.start()
+        try:
+            pos = 0
+            while pos < self.nframes:
+                frames = w._frombuffer(w.readframes(500))
+                if not np.array_equal(frames, self.frames[pos:pos + 500]):
+                    errors.append('readframes at %d' % pos)
+                pos += 500
+        finally:
+            done.set()
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(w.tell(), self.nframes)
+
+    def test_trailing_list(self):
+        # the LIST chunk after the frames is read without moving the position
+        for w in (self.w, wsig.read(SlowFile(open(EXAMPLE + '.pr1', 'rb').read()))):
+            w.setpos(1000)
+            first = w._frombuffer(w.readframes(10))
+            self.assertIsNotNone(w.getlistdata())
+            self.assertIsNotNone(w.getmetainfo())
+            second = w._frombuffer(w.readframes(10))
+            np.testing.assert_array_equal(np.concatenate([first, second]),
+                                          self.frames[1000:1020])
+
+    def test_truncated(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        path = os.path.join(tmp, 'truncated.pr1')
+        with open(EXAMPLE + '.pr1', 'rb') as f, open(path, 'wb') as g:
+            g.write(f.read()[:50001])
+        with wsig.read(path) as w:
+            frames = w._frombuffer(w.readframes(-1))
+            self.assertLess(len(frames), w.getnframes())
+            np.testing.assert_array_equal(w.asarray(), frames)
+        np.testing.assert_array_equal(wsig.memmap(path), frames)
+        dataset = wsig.loader.WindowDataset([path], window=1000, calibrated=False)
+        self.assertEqual(len(dataset), len(frames) // 1000)
+        np.testing.assert_array_equal(dataset[len(dataset) - 1],
+                                      frames[(len(dataset) - 1) * 1000:len(dataset) * 1000])
+
+    def test_setpos_rewind(self):
+        self.w.setpos(2000)
+        self.assertEqual(self.w.tell(), 2000)
+        np.testing.assert_array_equal(self.w._frombuffer(self.w.readframes(10)),
+                                      self.frames[2000:2010])
+        self.assertEqual(self.w.tell(), 2010)
+        self.w.rewind()
+        self.assertEqual(self.w.tell(), 0)
+        np.testing.assert_array_equal(self.w._frombuffer(self.w.readframes(10)),
+                                      self.frames[:10])
+        self.w.setpos(self.nframes)
+        self.assertEqual(self.w.readframes(10), b'')
+        self.assertRaises(wsig.Error, self.w.setpos, -1)
+        self.assertRaises(wsig.Error, self.w.setpos, self.nframes + 1)
+
+    def test_session_setpos_rewind(self):
+        with wsig.Session(EXAMPLE) as s:
+            whole = s.readcalibrated(-1)
+            s.setpos(100)
+            np.testing.assert_array_equal(s.readcalibrated(50), whole[100:150])
+            s.rewind()
+            self.assertEqual(s.tell(), 0)
+            np.testing.assert_array_equal(s.readcalibrated(50), whole[:50])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import wsig
+from wsig.resample import Resampler
+
+
+def resample(inrate, outrate, x, sizes):
+    r = Resampler(inrate, outrate, x.shape[1])
+    out = []
+    pos = 0
+    for size in sizes:
+        out.append(r.process(x[pos:pos + size]))
+        pos += size
+    out.append(r.process(x[pos:]))
+    out.append(r.flush())
+    return np.concatenate(out)
+
+
+class ResamplerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.x = np.random.default_rng(0).standard_normal((5000, 2))
+
+    def test_blocks(self):
+        # the output does not depend on the block sizes, however short
+        for inrate, outrate in [(2000, 44100), (44100, 2000), (3, 2), (2, 3), (1000, 1000)]:
+            whole = resample(inrate, outrate, self.x, [])
+            self.assertEqual(len(whole), -(-len(self.x) * outrate // inrate))
+            for sizes in ([3], [1] * 50, [4000] + [1] * 100, [7, 1, 0, 2, 900, 1, 1, 1]):
+                np.testing.assert_allclose(resample(inrate, outrate, self.x, sizes), whole,
+                                           rtol=1e-5, atol=1e-6)
+
+    def test_short_input(self):
+        for inrate, outrate in [(2000, 44100), (44100, 2000)]:
+            for n in (0, 1, 10):
+                out = resample(inrate, outrate, self.x[:n], [])
+                self.assertEqual(out.shape, (-(-n * outrate // inrate), 2))
+
+    def test_resampled(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        path = os.path.join(tmp, 'short.wav')
+        wsig.towave(path, 2000, (self.x[:10, 0] * 1000).astype(np.int16))
+        with wsig.read(path) as w:
+            out = np.concatenate(list(w.resampled(44100, blocksize=4)))
+        self.assertEqual(out.shape, (221, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
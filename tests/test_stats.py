@@ -0,0 +1,101 @@
+import os
+import unittest
+
+import numpy as np
+
+import wsig
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       'example', 'example')
+QS = (0, 1, 5, 10, 25, 50, 75, 95, 99, 100)
+
+
+def percentiles(values, qs=QS):
+    return np.percentile(values, qs, axis=0, method='inverted_cdf')
+
+
+class StatsTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.raw = rng.integers(-3000, 20000, size=(10000, 2)).astype(np.int16)
+
+    def check(self, stats, values):
+        np.testing.assert_allclose(stats.mean, values.mean(axis=0), rtol=1e-9)
+        np.testing.assert_allclose(stats.m2 / stats.count, values.var(axis=0), rtol=1e-9)
+        expected = percentiles(values)
+        for q, p in zip(QS, expected):
+            np.testing.assert_allclose(stats.percentile(q), p, rtol=1e-9)
+
+    def test_update(self):
+        stats = wsig.Stats(2)
+        stats.update(self.raw)
+        self.assertEqual(stats.count, len(self.raw))
+        np.testing.assert_array_equal(stats.min, self.raw.min(axis=0))
+        np.testing.assert_array_equal(stats.max, self.raw.max(axis=0))
+        self.check(stats, self.raw.astype(np.float64))
+
+    def test_merge(self):
+        parts = []
+        for block in np.array_split(self.raw, [10, 3000, 3001, 7000]):
+            stats = wsig.Stats(2)
+            stats.update(block)
+            parts.append(stats)
+        merged = wsig.Stats(2)
+        for stats in parts:
+            merged.merge(stats)
+        self.assertEqual(merged.count, len(self.raw))
+        np.testing.assert_array_equal(merged.min, self.raw.min(axis=0))
+        np.testing.assert_array_equal(merged.max, self.raw.max(axis=0))
+        self.check(merged, self.raw.astype(np.float64))
+        self.assertRaises(wsig.Error, merged.merge, wsig.Stats(2, factor=2.0))
+
+    def test_merge_coarse(self):
+        # a range wider than 2**16 values: the histogram bins of the parts
+        # have different widths
+        raw = np.random.default_rng(1).integers(-100000, 400000, size=(10000, 2)).astype(np.int32)
+        raw[3000:4000] //= 1000
+        whole = wsig.Stats(2, np.int32)
+        whole.update(raw)
+        merged = wsig.Stats(2, np.int32)
+        for block in np.array_split(raw, [3000, 4000]):
+            stats = wsig.Stats(2, np.int32)
+            stats.update(block)
+            merged.merge(stats)
+        self.assertGreater(whole._hist_shift, 0)
+        self.assertEqual(merged._hist_shift, whole._hist_shift)
+        np.testing.assert_array_equal(merged.hist, whole.hist)
+        np.testing.assert_allclose(merged.mean, raw.mean(axis=0), rtol=1e-9)
+        width = 1 << whole._hist_shift
+        for q, p in zip(QS, percentiles(raw)):
+            np.testing.assert_allclose(merged.percentile(q), p, atol=width)
+
+    def test_calibrated(self):
+        for zero, factor in [(100, 0.01), (100, -0.01), (0, -1.0)]:
+            stats = wsig.Stats(2, zero=zero, factor=factor)
+            stats.update(self.raw)
+            values = (self.raw.astype(np.float64) - zero) * factor
+            for q, p in zip(QS, percentiles(values)):
+                np.testing.assert_allclose(stats.percentile(q), p, rtol=1e-9)
+            summary = stats.summary()
+            np.testing.assert_allclose(summary['min'], values.min(axis=0))
+            np.testing.assert_allclose(summary['max'], values.max(axis=0))
+
+    def test_negative_factor(self):
+        stats = wsig.Stats(1, factor=-1.0)
+        stats.update(np.arange(100, dtype=np.int16))
+        self.assertEqual(stats.percentile(10)[0], -90)
+        self.assertEqual(stats.percentile(1)[0], -99)
+        self.assertEqual(stats.percentile(99)[0], -1)
+
+    def test_reader(self):
+        with wsig.read(EXAMPLE + '.pr1') as w:
+            values = w.readcalibrated(-1, np.float64)
+            w.rewind()
+            stats = w.stats()
+        for q, p in zip(QS, percentiles(values)):
+            np.testing.assert_allclose(stats.percentile(q), p, rtol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
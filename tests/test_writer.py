@@ -0,0 +1,51 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import wsig
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       'example', 'example')
+
+
+class WsigWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def test_roundtrip(self):
+        for ext in ('int', 'naf', 'pr2'):
+            src = EXAMPLE + '.' + ext
+            dst = os.path.join(self.dir, 'copy.' + ext)
+            with wsig.read(src) as r, wsig.WsigWriter(dst, like=r) as w:
+                for block in r.iterblocks(10000):
+                    w.writeframes(block)
+            with open(src, 'rb') as f, open(dst, 'rb') as g:
+                self.assertEqual(f.read(), g.read())
+
+    def test_default_limits(self):
+        # no sample of a full scale signal is clipped, whatever its width
+        for sampwidth in (1, 2, 3, 4):
+            dst = os.path.join(self.dir, 'default.wsig')
+            if sampwidth == 1:
+                low, high = 0, 255
+            else:
+                high = (1 << (8 * sampwidth - 1)) - 1
+                low = -high - 1
+            frames = np.linspace(low + 1, high - 1, 1000).round().astype(np.int64)
+            with wsig.WsigWriter(dst, rate=1000, sampwidth=sampwidth) as w:
+                w.writeframes(frames)
+            with wsig.read(dst) as r:
+                self.assertEqual(r.getadsc().highest, high)
+                self.assertEqual(r.getadsc().lowest, low)
+                np.testing.assert_array_equal(r._frombuffer(r.readframes(-1))[:, 0], frames)
+                r.rewind()
+                self.assertEqual(r.stats(False).clipped.sum(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import wsig
+import wsig.wsz
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       'example', 'example')
+
+
+class WszTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def roundtrip(self, src, **kwargs):
+        archive = os.path.join(self.dir, 'archive.wsz')
+        copy = os.path.join(self.dir, 'copy')
+        wsig.wsz.compress(src, archive, **kwargs)
+        wsig.wsz.decompress(archive, copy)
+        with open(src, 'rb') as f, open(copy, 'rb') as g:
+            self.assertEqual(f.read(), g.read())
+        return archive
+
+    def test_wsig(self):
+        for ext in ('int', 'oaf', 'pr1'):
+            src = EXAMPLE + '.' + ext
+            archive = self.roundtrip(src, blocksize=4096)
+            with wsig.read(src) as w, wsig.wsz.open(archive) as z:
+                frames = np.array(w.asarray())
+                np.testing.assert_array_equal(z.read_range(1000, 9000), frames[1000:9000])
+                np.testing.assert_array_equal(z.read_range(-3, 2), frames[:2])
+
+    def test_metadata(self):
+        # EVA stores the LIST chunk after the frames
+        for ext in ('int', 'pr2'):
+            src = EXAMPLE + '.' + ext
+            archive = self.roundtrip(src)
+            with wsig.read(src) as w, wsig.wsz.open(archive) as z:
+                self.assertIsNotNone(w.getlistdata())
+                self.assertEqual(z.getlistdata(), w.getlistdata())
+                self.assertEqual(z.getmetainfo(), w.getmetainfo())
+                self.assertEqual(z.getparams(), w.getparams())
+
+    def test_float(self):
+        rng = np.random.default_rng(0)
+        for dtype in (np.float32, np.float64):
+            frames = (rng.standard_normal((20000, 2)) * 0.3).astype(dtype)
+            src = os.path.join(self.dir, 'float.wav')
+            wsig.towave(src, 8000, frames)
+            for kwargs in ({}, {'codec': 'lzma'}, {'shuffle': False}):
+                archive = self.roundtrip(src, blocksize=4096, **kwargs)
+                with wsig.wsz.open(archive) as z:
+                    np.testing.assert_array_equal(z.read_range(1000, 15000),
+                                                  frames[1000:15000])
+
+
+if __name__ == '__main__':
+    unittest.main()
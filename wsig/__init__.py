@@ -0,0 +1,1906 @@
+__author__ = 'ShY'
+__copyright__ = 'Copyright 2019, SHY'
+__version__ = '1.1.0 (20190304)'
+__maintainer__ = 'ShY'
+__email__ = 'shi4yu2@gmail.com'
+__status__ = 'Pre-release'
+
+"""Parse SESANE RIFF / WAVE file 
+* RIFF format used by Alain Ghio: http://www.lpl-aix.fr/~ghio/
+* Format description: http://www.lpl-aix.fr/~ghio/Doc/TN-FormatFichierSESANE_EVA_Wsig.pdf
+
+Usage:
+
+Reading SESANE files (Wsig Type RIFF format) or WAVE files
+    f = wsig.open(file, 'r')
+where file is either the name of a file or an open file pointer.
+The open file pointer must have methods read(), seek(), and close().
+When the setpos() and rewind() methods are not used, the seek() methods is not necessary.
+
+This returns an instance of a class with the following public methods:
+      # Added methods for WSIG
+      getduration()       -- returns duration of signal
+      getparaname()       -- returns type of measure
+      getunit()           -- returns unit of measure 
+      getsignaldynamic()  -- returns signal dynamic (for calibration)
+      getvalueatmax()     -- returns max value (for calibration)
+      getzero()           -- returns calibration at zero (for calibration)
+      getmetainfo()       -- returns metadata from recording instrument
+      getsdsc()           -- returns the fields of the sdsc chunk
+      getadsc()           -- returns the fields of the adsc chunk
+      getlistdata()       -- returns the raw LIST chunk
+    
+      # Original methods for WAVE
+      getnchannels()  -- returns number of audio channels (1 for
+                         mono, 2 for stereo)
+      getsampwidth()  -- returns sample width in bytes
+      getframerate()  -- returns sampling frequency
+      getnframes()    -- returns number of audio frames
+      getcomptype()   -- returns compression type ('NONE' for linear samples)
+      getcompname()   -- returns human-readable version of
+                         compression type ('not compressed' linear samples)
+      getparams()     -- returns a namedtuple consisting of all of the
+                         above in the above order
+      getmarkers()    -- returns None (for compatibility with the
+                         aifc module)
+      getmark(id)     -- raises an error since the mark does not
+                         exist (for compatibility with the aifc module)
+      readframes(n)   -- returns at most n frames of audio
+      asarray()       -- returns a read-only numpy.memmap of the samples
+      readcalibrated(n, dtype, out)
+                      -- returns at most n calibrated frames as a numpy array
+      iterblocks(blocksize, overlap, calibrated)
+                      -- generates successive blocks of frames as numpy arrays
+      iterwindows(duration, overlap, calibrated)
+                      -- same as iterblocks() with sizes in seconds
+      read_range(start, stop, calibrated)
+                      -- returns frames [start, stop) as a numpy array
+      read_at(frame, nframes, calibrated)
+                      -- same as read_range(), without using the position
+                         (can be called by several threads at once)
+      read_time_range(t0, t1, calibrated)
+                      -- same as read_range() with times in seconds
+      stats(calibrated)
+                      -- returns the statistics of the signal (Stats)
+      resampled(rate, blocksize, calibrated)
+                      -- generates the signal resampled to rate by blocks
+      getiostats()    -- returns the I/O counters of the instance (see
+                         instrument())
+      rewind()        -- rewind to the beginning of the audio stream
+      setpos(pos)     -- seek to the specified position
+      tell()          -- return the current position
+      close()         -- close the instance (make it unusable)
+The position returned by tell() and the position given to setpos()
+are compatible and have nothing to do with the actual position in the
+file.
+The close() method is called automatically when the class instance
+is destroyed.
+"""
+
+import builtins
+import concurrent.futures
+import contextlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+__all__ = ["read", "memmap", "scan", "verify", "towave", "instrument", "getiostats", "resetiostats",
+           "Error", "WsigRead", "Session", "Envelope", "Stats", "WaveWriter", "WsigWriter"]
+
+
+class Error(Exception):
+    pass
+
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xfffe
+KNOWN_WAVE_FORMATS = (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT)
+# SubFormat GUID of WAVE_FORMAT_EXTENSIBLE, after the format tag
+_KSDATAFORMAT_SUBTYPE = b'\x00\x00\x00\x00\x10\x00\x80\x00\x00\xaa\x00\x38\x9b\x71'
+_WAVE_MAX_DATA = 0xffffffff - 36
+_HEADER_READ = 4096
+_STATS_BINS = 1 << 16
+
+_array_fmts = None, 'b', 'h', None, 'i'
+# numpy types of the samples by sample width (24-bit samples are
+# decoded into int32, see _unpack24())
+_numpy_fmts = None, 'u1', 'i2', 'i4', 'i4'
+_float_fmts = None, None, None, None, 'f4', None, None, None, 'f8'
+
+import struct
+import sys
+from struct import *
+from collections import namedtuple
+import warnings
+import numpy as np
+
+# I/O counters, collected only while instrumentation is enabled (WSIG_STATS
+# environment variable or instrument()): per instance and process-wide
+_IOSTATS = ('headers', 'read_calls', 'bytes_read', 'seeks', 'write_calls', 'bytes_written',
+            'header_time', 'read_time', 'byteswap_time', 'calibration_time', 'write_time')
+_instrumented = os.environ.get('WSIG_STATS', '0') not in ('', '0')
+_instrumented_env = _instrumented
+_instrument_blocks = [0, 0]  # instrument() blocks entered and not exited: enabled, disabled
+_iostats = dict.fromkeys(_IOSTATS, 0)
+_iostats_lock = threading.Lock()
+
+
+def _count(stats, **counters):
+    for name, value in counters.items():
+        stats[name] += value
+    with _iostats_lock:
+        for name, value in counters.items():
+            _iostats[name] += value
+
+
+@contextlib.contextmanager
+def instrument(enabled=True):
+    """Collect the I/O counters inside the with block:
+
+        with wsig.instrument():
+            conversion.convert(input, output)
+        print(wsig.getiostats())
+
+    Instrumentation is process-wide (all threads); it is also enabled
+    from the start when the environment variable WSIG_STATS is set to a
+    value other than 0. When disabled, its cost is one test per I/O call.
+    with blocks may overlap, in several threads: instrumentation is
+    enabled while at least one instrument() block is running, otherwise
+    it is disabled while an instrument(False) block is running.
+    """
+    i = 0 if enabled else 1
+    with _iostats_lock:
+        _instrument_blocks[i] += 1
+        _set_instrumented()
+    try:
+        yield
+    finally:
+        with _iostats_lock:
+            _instrument_blocks[i] -= 1
+            _set_instrumented()
+
+
+def _set_instrumented():
+    # called with _iostats_lock held
+    global _instrumented
+    enabled, disabled = _instrument_blocks
+    _instrumented = enabled > 0 or (_instrumented_env and not disabled)
+
+
+def getiostats():
+    """Return the process-wide I/O counters (a dict):
+        headers -- number of headers parsed
+        read_calls, bytes_read -- read() calls on the files and bytes read
+        seeks -- seek() calls on the files (header, data chunk, positional
+                 reads without file descriptor, header rewritten by a
+                 writer)
+        write_calls, bytes_written -- write() calls and bytes written
+        header_time, read_time, byteswap_time, calibration_time,
+        write_time -- seconds spent in each stage
+    """
+    with _iostats_lock:
+        return dict(_iostats)
+
+
+def resetiostats():
+    """Reset the process-wide I/O counters to zero"""
+    with _iostats_lock:
+        _iostats.update(dict.fromkeys(_IOSTATS, 0))
+
+
+# fields of the sdsc and adsc chunks, see _read_sdsc_chunk() and _read_adsc_chunk()
+_SDSC_FORMAT = '<LL80s16sLLhhhhiL'
+_ADSC_FORMAT = '<LHLLHiiiHH'
+_sdsc_params = namedtuple('_sdsc_params',
+                          's_size acronym paraname unitname snsamples sampfreq '
+                          's_max s_min cmax czero imax fmax')
+_adsc_params = namedtuple('_adsc_params',
+                          'a_size nch ansamples acquifreq bps highest lowest zero reccode recver')
+
+_wave_params = namedtuple('_wave_params',
+                          'nchannels sampwidth framerate '
+                          'nframes comptype compname '
+                          'duration paraname unit signaldynamic valueatmax zero')
+
+
+##############################################################################################
+
+class WsigRead:
+    """Variables used in this class:
+
+    These variables are available to the user through appropriate
+    methods of this class:
+    # Added variables
+    _metaInfo -- Metadata from recording instrument
+                 available through the getmetainfo() method
+
+    _paraname -- name of parameter
+
+    _unitname -- name of unit
+
+    _s_max -- max value of the signal
+
+    _s_min -- min value of the signal
+
+    _czero -- calibration at zero
+
+    _signaldynamic -- Signal Dynamic = cmax - czero
+
+    _valueatmax -- Value at Max = imax + fmax / 1000000.0
+
+    _highest, _lowest -- highest and lowest values of the acquisition
+
+    _snsamples, _ansamples -- numbers of samples given by the sdsc and
+                              adsc chunks (None if absent)
+
+    _format -- WAVE_FORMAT_PCM or WAVE_FORMAT_IEEE_FLOAT (WAVE files)
+
+    # Original variables
+    _file -- the open file with methods read(), close(), and seek()
+             set through the __init__() method
+    _nchannels -- the number of audio channels
+                 available through the getnchannels() method
+    _nframes -- the number of audio frames
+                available through the getnframes() method
+    _framerate -- the sampling frequency
+                  available through the getframerate() method
+    _soundpos -- the position in the audio stream
+                 available through the tell() method, set through the
+                 setpos() method
+
+    These variables are used internally only:
+    # Added interval variables
+    _
+
+    # Original internal variables
+    _fmt_chunk_read -- 1 iff the FMT chunk has been read
+    _data_seek_needed -- 1 iff positioned correctly in audio
+                         file for readframes()
+    _data_size -- size of the DATA chunk
+    _data_offset -- absolute offset of the DATA chunk samples in the file
+                    (None if the file is not seekable)
+    _pending -- samples read along with the header, not yet returned
+    _list_data -- raw LIST chunk, decoded by getmetainfo()
+    _framesize -- size of one frame in the file
+    _iostats -- I/O counters of the instance, see getiostats()
+    _fileno -- file descriptor used by read_at() (None if not available)
+    _lock -- serializes read_at() and readframes() on files without file
+             descriptor
+    """
+
+    def initfp(self, file):
+        # the flag is read once: instrument() may change it meanwhile
+        instrumented = _instrumented
+        if instrumented:
+            start = time.perf_counter()
+        self._iostats = dict.fromkeys(_IOSTATS, 0)
+        self._convert = None
+        self._format = WAVE_FORMAT_PCM
+        self._soundpos = 0
+        self._file = file
+        try:
+            base = file.tell()
+        except (AttributeError, OSError):
+            base = None
+        # The whole header region is normally read at once and walked
+        # with struct.unpack_from(): no per-chunk read() calls.
+        buf = self._read(_HEADER_READ)
+        if len(buf) < 8:
+            raise EOFError
+        if buf[:4] != b'RIFF':
+            raise Error('File does not start with RIFF id')
+        self._riffsize = struct.unpack_from('<L', buf, 4)[0]
+        self._filetype = buf[8:12]
+        if not (self._filetype == b'WSIG' or self._filetype == b'WAVE'):
+            raise Error('not a SESANE or WAVE file')
+        if self._filetype == b'WAVE':
+            # WAVE files do not describe the measure: identity calibration
+            self._paraname = ''
+            self._unitname = ''
+            self._czero = 0
+            self._signaldynamic = 1.0
+            self._valueatmax = 1.0
+
+        # Initialise chunk fetching
+        self._fmt_chunk_read = 0
+        self._sdsc_chunk_read = 0
+        self._adsc_chunk_read = 0
+        self._list_chunk_read = 0
+        self._info_chunk_read = 0
+        self._list_data = None
+        self._metaInfo = None
+        self._data_size = None
+        self._data_offset = None
+        self._data_seek_needed = 1
+        self._pending = b''
+        self._highest = self._lowest = None
+        self._snsamples = self._ansamples = None
+        self._sdsc = self._adsc = None
+        self._riff_offset = base
+        self._list_searched = 0
+        self._lock = threading.Lock()
+        try:
+            self._fileno = file.fileno() if hasattr(os, 'pread') else None
+        except (AttributeError, OSError, ValueError):
+            # io.UnsupportedOperation is an OSError and a ValueError
+            self._fileno = None
+
+        if self._filetype == b'WAVE':
+            parsers = {b'fmt ': self._read_fmt_chunk}
+        else:
+            parsers = {b'fmt ': self._read_fmt_chunk,
+                       b'sdsc': self._read_sdsc_chunk,
+                       b'adsc': self._read_adsc_chunk,
+                       b'LIST': self._read_list_chunk}
+        bufstart = 0  # position of buf in the file (from the RIFF id)
+        pos = 12  # position of the next chunk
+        riffend = 8 + self._riffsize
+        while pos + 8 <= riffend:
+            if pos + 8 > bufstart + len(buf):
+                buf, bufstart = self._fill_header(buf, bufstart, pos, 8, base)
+                if pos + 8 > bufstart + len(buf):
+                    break
+            i = pos - bufstart
+            chunkname = buf[i:i + 4]
+            chunksize = struct.unpack_from('<L', buf, i + 4)[0]
+            if chunkname == b'data':
+                if self._filetype == b'WAVE':
+                    if not self._fmt_chunk_read:
+                        raise Error('data chunk before fmt chunk')
+                elif not self._sdsc_chunk_read:
+                    raise Error('data chunk before sdsc chunk')
+                elif not self._adsc_chunk_read:
+                    # EVA2 version
+                    # We make assumption about sampwidth here
+                    sampwidth = 16
+                    self._nchannels = 1
+                    self._sampwidth = (sampwidth + 7) // 8
+                    self._framesize = self._nchannels * self._sampwidth
+                    self._comptype = 'NONE'
+                    self._compname = 'not compressed'
+                    self._adsc_chunk_read = 1
+                self._data_size = chunksize
+                self._nframes = chunksize // self._framesize
+                if base is not None:
+                    self._data_offset = base + pos + 8
+                # samples already read with the header
+                self._pending = buf[i + 8:i + 8 + chunksize]
+                self._data_seek_needed = 0
+                break
+            parser = parsers.get(chunkname)
+            if parser is not None:
+                if pos + 8 + chunksize > bufstart + len(buf):
+                    buf, bufstart = self._fill_header(buf, bufstart, pos, 8 + chunksize, base)
+                    i = pos - bufstart
+                parser(memoryview(buf)[i + 8:i + 8 + chunksize])
+                if chunkname == b'fmt ':
+                    self._fmt_chunk_read = 1
+                elif chunkname == b'sdsc':
+                    self._sdsc_chunk_read = 1
+                elif chunkname == b'adsc':
+                    self._adsc_chunk_read = 1
+                else:
+                    self._list_chunk_read = 1
+            pos += 8 + chunksize + (chunksize & 1)
+        if self._filetype == b'WAVE':
+            if not self._fmt_chunk_read or self._data_size is None:
+                raise Error('fmt chunk and/or data chunk missing')
+        elif self._filetype == b'WSIG':
+            if not self._sdsc_chunk_read:
+                raise Error('sdsc chunk missing')
+            elif not self._adsc_chunk_read:
+                raise Error('adsc chunk missing')
+            elif self._data_size is None:
+                raise Error('data chunk missing')
+        if instrumented:
+            _count(self._iostats, headers=1, header_time=time.perf_counter() - start)
+
+    def __init__(self, f):
+        self._i_opened_the_file = None
+        if isinstance(f, str):
+            f = builtins.open(f, 'rb')
+            self._i_opened_the_file = f
+        # else, assume it is an open file object already
+        try:
+            self.initfp(f)
+        except:
+            if self._i_opened_the_file:
+                f.close()
+            raise
+
+    def __del__(self):
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # ==============================================================
+    # User visible methods
+    # ==============================================================
+    def getfp(self):
+        return self._file
+
+    def rewind(self):
+        self._data_seek_needed = 1
+        self._soundpos = 0
+
+    def close(self):
+        self._file = None
+        file = self._i_opened_the_file
+        if file:
+            self._i_opened_the_file
+            if file:
+                self._i_opened_the_file = None
+                file.close()
+
+    def tell(self):
+        return self._soundpos
+
+    def getnchannels(self):
+        return self._nchannels
+
+    def getnframes(self):
+        return self._nframes
+
+    def getsampwith(self):
+        return self._sampwidth
+
+    def getframerate(self):
+        return self._framerate
+
+    def getcomptype(self):
+        return self._comptype
+
+    def getcompname(self):
+        return self._compname
+
+    def getparaname(self):
+        return self._paraname
+
+    def getunit(self):
+        return self._unitname
+
+    def getsignaldynamic(self):
+        return self._signaldynamic
+
+    def getvalueatmax(self):
+        return self._valueatmax
+
+    def getzero(self):
+        return self._czero
+
+    def getparams(self):
+        return _wave_params(self.getnchannels(), self.getsampwith(),
+                            self.getframerate(), self.getnframes(),
+                            self.getcomptype(), self.getcompname(),
+                            self.getduration(), self.getparaname(),
+                            self.getunit(), self.getsignaldynamic(),
+                            self.getvalueatmax(), self.getzero())
+
+    def getsdsc(self):
+        """Return the fields of the sdsc chunk (namedtuple), or None"""
+        return self._sdsc
+
+    def getadsc(self):
+        """Return the fields of the adsc chunk (namedtuple), or None"""
+        return self._adsc
+
+    def getlistdata(self):
+        """Return the body of the LIST chunk (bytes), or None. A LIST chunk
+        after the data chunk (as written by EVA) is read on first call,
+        with read_at() reads which do not move the position."""
+        if self._list_data is None and not self._list_searched:
+            self._list_data = self._read_trailing_list()
+            self._list_searched = 1
+        return self._list_data
+
+    def getmetainfo(self):
+        if self._metaInfo is None and self.getlistdata() is not None:
+            MetaInfo = self._list_data.replace(b'\x00', b' ').decode('ascii')
+            MetaInfo = MetaInfo.split('   ')
+            self._metaInfo = MetaInfo
+        return self._metaInfo
+
+    def getmarkers(self):
+        return None
+
+    def getiostats(self):
+        """Return the I/O counters of this instance (see wsig.getiostats()),
+        collected while instrumentation is enabled"""
+        return dict(self._iostats)
+
+    def getmark(selfself, id):
+        raise Error('no marks')
+
+    def getduration(self):
+        self._duration = self._nframes / float(self._framerate)
+        return self._duration
+
+    def setpos(self, pos):
+        if pos < 0 or pos > self._nframes:
+            raise Error('position not in range')
+        self._soundpos = pos
+        self._data_seek_needed = 1
+
+    def readframes(self, nframes):
+        # Samples are returned in native byte order, except 24-bit samples
+        # which stay packed little-endian as in the file
+        if self._fileno is None:
+            # read_at() seeks this file object under the lock
+            with self._lock:
+                data = self._readraw(nframes)
+        else:
+            data = self._readraw(nframes)
+        if self._sampwidth != 1 and self._sampwidth != 3 and sys.byteorder == 'big':
+            instrumented = _instrumented
+            if instrumented:
+                start = time.perf_counter()
+            data = np.frombuffer(data, self._dtype()).byteswap().tobytes()
+            if instrumented:
+                _count(self._iostats, byteswap_time=time.perf_counter() - start)
+        if self._convert and data:
+            data = self._convert(data)
+        self._soundpos = self._soundpos + len(data) // (self._nchannels * self._sampwidth)
+        return data
+
+    def asarray(self):
+        """Return the samples as a read-only numpy.memmap of shape
+        (nframes, nchannels), mapped directly over the data chunk.
+        No sample is read or copied until it is accessed. Not available
+        for 24-bit samples, which have no numpy type. The frames of a
+        truncated file are those actually in the file, as readframes().
+        """
+        if self._data_offset is None or not hasattr(self._file, 'fileno'):
+            raise Error('memory mapping needs a seekable file with a file descriptor')
+        if self._sampwidth == 3:
+            raise Error('24-bit samples cannot be memory mapped')
+        dtype = self._dtype().newbyteorder('<')
+        nframes = self._available_frames()
+        shape = (nframes, self._nchannels)
+        if not nframes:
+            data = np.empty(shape, dtype)
+            data.flags.writeable = False
+            return data
+        data = np.memmap(self._file, dtype=dtype, mode='r',
+                         offset=self._data_offset, shape=shape)
+        # np.memmap moves the file pointer to measure the file
+        self._data_seek_needed = 1
+        return data
+
+    def readcalibrated(self, nframes, dtype=np.float32, out=None):
+        """Read at most nframes frames and return them calibrated, as an
+        array of shape (frames, nchannels):
+            val_calib = (valint - czero) * (valueatmax / signaldynamic)
+        WAVE files are not calibrated, their samples are only converted
+        to dtype.
+
+        If out is given, the samples are written into it (its dtype takes
+        precedence over dtype, at most len(out) frames are read) and the
+        filled part of out is returned. No full size temporary is created.
+        """
+        if out is not None:
+            if out.ndim != 2 or out.shape[1] != self._nchannels:
+                raise ValueError('out must have shape (frames, %d)' % self._nchannels)
+            if nframes < 0 or nframes > len(out):
+                nframes = len(out)
+        raw = self._frombuffer(self.readframes(nframes))
+        if out is None:
+            out = np.empty(raw.shape, dtype)
+        else:
+            out = out[:len(raw)]
+        return self._calibrate(raw, out)
+
+    def read_range(self, start, stop, calibrated=False, dtype=np.float32):
+        """Return the frames [start, stop) as an array of shape
+        (frames, nchannels), calibrated into dtype if calibrated is true.
+        The range is clipped to the signal like a slice. Only the frames
+        of the range are read, with read_at(), and the position is left
+        at the end of the range.
+        """
+        start = min(max(0, start), self._nframes)
+        stop = min(max(start, stop), self._nframes)
+        frames = self.read_at(start, stop - start, calibrated, dtype)
+        self._soundpos = start + len(frames)
+        self._data_seek_needed = 1
+        return frames
+
+    def read_at(self, frame, nframes, calibrated=False, dtype=np.float32):
+        """Return at most nframes frames from frame (all the frames to the
+        end if nframes < 0) as read_range(), without using or changing the
+        position of readframes(). Several threads can call read_at() on
+        the same instance at once: the file is read with os.pread(), which
+        releases the GIL, or, for file objects without file descriptor,
+        under a lock.
+        """
+        if self._data_offset is None:
+            raise Error('cannot seek in a file which is not seekable')
+        start = min(max(0, frame), self._nframes)
+        if nframes < 0:
+            stop = self._nframes
+        else:
+            stop = min(start + nframes, self._nframes)
+        data = self._pread(self._data_offset + start * self._framesize,
+                           (stop - start) * self._framesize)
+        data = data[:len(data) - len(data) % self._framesize]
+        if self._sampwidth == 3:
+            raw = _unpack24(data).reshape(-1, self._nchannels)
+        else:
+            raw = np.frombuffer(data, self._dtype().newbyteorder('<')).reshape(-1, self._nchannels)
+        if not calibrated:
+            return raw.astype(self._dtype(), copy=False)
+        return self._calibrate(raw, np.empty(raw.shape, dtype))
+
+    def read_time_range(self, t0, t1, calibrated=False, dtype=np.float32):
+        """Same as read_range(), with the range [t0, t1) in seconds."""
+        return self.read_range(int(round(t0 * self._framerate)),
+                               int(round(t1 * self._framerate)), calibrated, dtype)
+
+    def iterblocks(self, blocksize, overlap=0, calibrated=False, dtype=np.float32):
+        """Generate successive blocks of at most blocksize frames, starting
+        at the current position, as arrays of shape (frames, nchannels).
+        Consecutive blocks share overlap frames; only the last block may
+        be shorter than blocksize.
+
+        If calibrated is true, blocks are calibrated as by readcalibrated()
+        into dtype, otherwise the raw samples are returned.
+
+        All blocks are views of a single buffer which is overwritten at
+        the next step: copy a block to keep it.
+        """
+        if not calibrated:
+            dtype = self._dtype()
+        buffer = np.empty((blocksize, self._nchannels), dtype)
+        if calibrated:
+            return _iterblocks(lambda out: len(self.readcalibrated(-1, out=out)), buffer, overlap)
+        return _iterblocks(self._readinto, buffer, overlap)
+
+    def iterwindows(self, duration, overlap=0.0, calibrated=False, dtype=np.float32):
+        """Same as iterblocks(), with the window duration and the overlap
+        given in seconds."""
+        blocksize = int(round(duration * self._framerate))
+        overlap = int(round(overlap * self._framerate))
+        return self.iterblocks(blocksize, overlap, calibrated, dtype)
+
+    def stats(self, calibrated=True, blocksize=65536):
+        """Return the Stats of the frames from the current position to
+        the end, computed in one streaming pass of blocksize frames.
+        Values are calibrated if calibrated is true (WAVE files are never
+        calibrated). Clipped samples are the samples at or beyond the
+        signal limits (sdsc s_max/s_min, for 8 and 16-bit samples) or the
+        acquisition limits (adsc highest/lowest), or the limits of the
+        sample type for WAVE files.
+        """
+        if calibrated and self._filetype == b'WSIG':
+            zero, factor = self._czero, self._calibration_factor()
+        else:
+            zero, factor = 0, 1.0
+        s = Stats(self._nchannels, self._dtype(), self._clip_limits(), zero, factor)
+        for block in self.iterblocks(blocksize):
+            s.update(block)
+        return s
+
+    def resampled(self, rate, blocksize=65536, calibrated=True, dtype=np.float32):
+        """Generate the frames from the current position to the end,
+        resampled to rate, as successive arrays of shape (frames, nchannels),
+        reading blocksize frames at a time (see wsig.resample.Resampler).
+        """
+        from .resample import Resampler
+        resampler = Resampler(self._framerate, rate, self._nchannels, dtype=dtype)
+        for block in self.iterblocks(blocksize, calibrated=calibrated, dtype=np.float64):
+            out = resampler.process(block)
+            if len(out):
+                yield out
+        out = resampler.flush()
+        if len(out):
+            yield out
+
+    # ==============================================================
+    # Internal methods
+    # ==============================================================
+    def _fill_header(self, buf, bufstart, pos, size, base):
+        # Return a header buffer holding [pos, pos + size) if the file is
+        # long enough, reading only what is missing
+        end = bufstart + len(buf)
+        if pos > end:
+            if base is not None:
+                self._file.seek(base + pos)
+                if _instrumented:
+                    _count(self._iostats, seeks=1)
+            else:
+                skip = pos - end
+                while skip > 0:
+                    data = self._read(min(skip, 1 << 20))
+                    if not data:
+                        break
+                    skip -= len(data)
+            buf, bufstart = b'', pos
+        else:
+            buf, bufstart = buf[pos - bufstart:], pos
+        if len(buf) < size:
+            buf += self._read(size - len(buf) + _HEADER_READ)
+        return buf, bufstart
+
+    def _read_trailing_list(self):
+        # Look for a LIST chunk after the data chunk, reading only the
+        # chunk headers, without moving the file position
+        if self._data_offset is None or self._filetype != b'WSIG':
+            return None
+        pos = self._data_offset + self._data_size + (self._data_size & 1)
+        end = self._riff_offset + 8 + self._riffsize
+        while pos + 8 <= end:
+            header = self._pread(pos, 8)
+            if len(header) < 8:
+                break
+            chunkname, chunksize = struct.unpack('<4sL', header)
+            if chunkname == b'LIST':
+                data = self._pread(pos + 8, chunksize)
+                return data if len(data) == chunksize else None
+            pos += 8 + chunksize + (chunksize & 1)
+        return None
+
+    def _pread(self, offset, size):
+        # Read size bytes at offset without using the file position
+        instrumented = _instrumented
+        if instrumented:
+            start = time.perf_counter()
+        if self._fileno is not None:
+            data = os.pread(self._fileno, size, offset)
+            # os.pread() may return less than asked (large sizes)
+            while 0 < len(data) < size:
+                more = os.pread(self._fileno, size - len(data), offset + len(data))
+                if not more:
+                    break
+                data += more
+        else:
+            with self._lock:
+                pos = self._file.tell()
+                self._file.seek(offset)
+                data = self._file.read(size)
+                self._file.seek(pos)
+        if instrumented:
+            # os.pread() does not seek, the fallback seeks and seeks back
+            _count(self._iostats, read_calls=1, bytes_read=len(data),
+                   seeks=0 if self._fileno is not None else 2,
+                   read_time=time.perf_counter() - start)
+        return data
+
+    def _readraw(self, nframes):
+        # Read at most nframes whole frames at the current position
+        if self._data_seek_needed:
+            if self._data_offset is None:
+                raise Error('cannot seek in a file which is not seekable')
+            self._file.seek(self._data_offset + self._soundpos * self._framesize)
+            if _instrumented:
+                _count(self._iostats, seeks=1)
+            self._pending = b''
+            self._data_seek_needed = 0
+        if nframes == 0:
+            return b''
+        remaining = self._nframes - self._soundpos
+        if nframes < 0 or nframes > remaining:
+            nframes = remaining
+        data = self._read_data(nframes * self._framesize)
+        return data[:len(data) - len(data) % self._framesize]
+
+    def _available_frames(self):
+        # Number of frames actually in the file: the data chunk of a
+        # truncated file ends before the size given by its header
+        size = os.fstat(self._file.fileno()).st_size
+        return max(0, min(self._nframes, (size - self._data_offset) // self._framesize))
+
+    def _read_data(self, size):
+        # Read size bytes of the data chunk, starting with the bytes
+        # already read with the header
+        pending = self._pending
+        if not pending:
+            return self._read(size)
+        if len(pending) >= size:
+            self._pending = pending[size:]
+            return pending[:size]
+        self._pending = b''
+        return pending + self._read(size - len(pending))
+
+    def _read(self, size):
+        if not _instrumented:
+            return self._file.read(size)
+        start = time.perf_counter()
+        data = self._file.read(size)
+        _count(self._iostats, read_calls=1, bytes_read=len(data),
+               read_time=time.perf_counter() - start)
+        return data
+
+    def _readinto(self, out):
+        raw = self._frombuffer(self.readframes(len(out)))
+        out[:len(raw)] = raw
+        return len(raw)
+
+    def _dtype(self):
+        fmts = _float_fmts if self._format == WAVE_FORMAT_IEEE_FLOAT else _numpy_fmts
+        if self._sampwidth >= len(fmts) or not fmts[self._sampwidth]:
+            raise Error('unsupported sample width %d' % self._sampwidth)
+        return np.dtype(fmts[self._sampwidth])
+
+    def _frombuffer(self, data):
+        # readframes() returns samples in native byte order
+        if self._sampwidth == 3:
+            return _unpack24(data).reshape(-1, self._nchannels)
+        return np.frombuffer(data, self._dtype()).reshape(-1, self._nchannels)
+
+    def _clip_limits(self):
+        if self._format == WAVE_FORMAT_IEEE_FLOAT:
+            # full scale of float samples
+            low, high = -1.0, 1.0
+        elif self._sampwidth == 1:
+            low, high = 0, 255
+        else:
+            bits = 8 * self._sampwidth - 1
+            low, high = -(1 << bits), (1 << bits) - 1
+        if self._filetype == b'WSIG':
+            if self._sampwidth <= 2:
+                # s_max and s_min are 16-bit fields
+                low, high = max(low, self._s_min), min(high, self._s_max)
+            if self._highest is not None:
+                low, high = max(low, self._lowest), min(high, self._highest)
+        return low, high
+
+    def _calibrate(self, raw, out):
+        # Write the calibrated raw samples into out
+        instrumented = _instrumented
+        if instrumented:
+            start = time.perf_counter()
+        if self._filetype == b'WSIG':
+            np.subtract(raw, self._czero, out=out, dtype=out.dtype, casting='unsafe')
+            np.multiply(out, self._calibration_factor(), out=out)
+        else:
+            out[...] = raw
+        if instrumented:
+            _count(self._iostats, calibration_time=time.perf_counter() - start)
+        return out
+
+    def _calibration_factor(self):
+        if not self._signaldynamic:
+            raise Error('bad signal dynamic')
+        return self._valueatmax / self._signaldynamic
+
+    def _read_fmt_chunk(self, data):
+        try:
+            wFormatTag, self._nchannels, self._framerate, dwAvgBytesPerSec, wBlockAlign = struct.unpack_from('<HHLLH',
+                                                                                                             data)
+        except struct.error:
+            raise EOFError from None
+        try:
+            sampwidth = struct.unpack_from('<H', data, 14)[0]
+            if wFormatTag == WAVE_FORMAT_EXTENSIBLE:
+                # the actual format is given by the SubFormat GUID
+                wFormatTag = struct.unpack_from('<H', data, 24)[0]
+                if len(data) < 40:
+                    raise EOFError
+                if bytes(data[26:40]) != _KSDATAFORMAT_SUBTYPE:
+                    raise Error('unknown format: %r' % (bytes(data[24:40]),))
+        except struct.error:
+            raise EOFError from None
+        if wFormatTag not in KNOWN_WAVE_FORMATS:
+            raise Error('unknown format: %r' % (wFormatTag,))
+        self._format = wFormatTag
+        self._sampwidth = (sampwidth + 7) // 8
+        if not self._sampwidth:
+            raise Error('bad sample width')
+        if not self._nchannels:
+            raise Error('bad # of channels')
+        self._framesize = self._nchannels * self._sampwidth
+        self._comptype = 'NONE'
+        self._compname = 'not compressed'
+
+    def _read_sdsc_chunk(self, data):
+        """Variables used in this methods
+        s_size -- size of the structure = 128 octets
+        acronym -- acronym of parameter
+        paramname -- name of parameter
+        unitname -- unit name of parameter
+        snsamples -- number of samples in 'data
+        sampfreq -- sampling rate
+        s_max -- max value of the signal
+        s_min -- min value of the signal
+        cmax -- calibration at max
+        czero -- calibration at zero
+        imax -- integer part of the value at maximum
+        fmax -- floating part x 10^6 of the maximum
+        """
+        try:
+            self._sdsc = _sdsc_params._make(unpack_from(_SDSC_FORMAT, data))
+        except struct.error:
+            raise EOFError from None
+        (s_size, acronym, paraname,
+         unitname, self._snsamples, self._framerate,
+         self._s_max, self._s_min, cmax, self._czero,
+         imax, fmax) = self._sdsc
+
+        # handle redundant characters
+        self._paraname = paraname.replace(b'\x00', b'').decode('ascii')
+        self._unitname = unitname.replace(b'\x00', b'').decode('ascii')
+
+        # Calibration setting
+        self._signaldynamic = float(cmax - self._czero)
+        self._valueatmax = float(imax) + fmax / float(100000)
+
+    def _read_adsc_chunk(self, data):
+        """Variables used in this methods
+        a_size -- size of the structure = 32 octets
+        nch -- number of channels
+        ansamples -- number of samples
+        acquifreq -- acquisition frequency
+        bps -- bits per sample
+        highest --- highest value
+        lowest -- lowest value
+        zero -- zero
+        reccode -- recording program code
+        recver -- version of the acquisition program
+        """
+        try:
+            self._adsc = _adsc_params._make(unpack_from(_ADSC_FORMAT, data))
+        except struct.error:
+            raise EOFError from None
+        (a_size, self._nchannels, self._ansamples, acquifreq,
+         sampwidth, self._highest, self._lowest, zero,
+         reccode, recver) = self._adsc
+        self._sampwidth = (sampwidth + 7) // 8
+        if not self._sampwidth:
+            raise Error('bad sample width')
+        if not self._nchannels:
+            raise Error('bad # of channels')
+        self._framesize = self._nchannels * self._sampwidth
+        self._comptype = 'NONE'
+        self._compname = 'not compressed'
+
+    def _read_list_chunk(self, data):
+        # decoded on demand by getmetainfo()
+        self._list_data = bytes(data)
+
+
+class Stats:
+    """Statistics of a signal, per channel, computed block by block.
+
+        s = wsig.read(file).stats()
+        s.summary()  # -> {'min': [...], 'max': [...], 'mean': [...], ...}
+
+    update(block) adds a block of raw samples of shape (frames, nchannels).
+    Partial results (parts of a signal, signals processed by different
+    workers) are combined with merge(): mean and variance use Welford /
+    Chan updates, percentiles come from a histogram of the raw values of
+    at most 2**16 bins, whose width doubles whenever the range of the
+    values gets wider. Percentiles are exact for signals spanning at most
+    2**16 raw values (all 8 and 16-bit signals). Float samples are
+    histogrammed on a grid of 2**-24 (the precision of float32 near full
+    scale), and their default clipping limits are -1 and 1. Values are
+    reported calibrated as
+        (raw - zero) * factor
+    """
+
+    def __init__(self, nchannels, dtype=np.int16, clip=None, zero=0, factor=1.0):
+        dtype = np.dtype(dtype)
+        self.nchannels = nchannels
+        self.dtype = dtype
+        if dtype.kind == 'f':
+            limits = -1.0, 1.0
+            self.min = np.full(nchannels, np.inf)
+            self.max = np.full(nchannels, -np.inf)
+            self._scale = float(1 << 24)
+        else:
+            info = np.iinfo(dtype)
+            limits = info.min, info.max
+            self.min = np.full(nchannels, info.max, np.int64)
+            self.max = np.full(nchannels, info.min, np.int64)
+            self._scale = 1
+        self.clip = clip if clip is not None else limits
+        self.zero = zero
+        self.factor = factor
+        self.count = 0
+        self.mean = np.zeros(nchannels)
+        self.m2 = np.zeros(nchannels)
+        self.clipped = np.zeros(nchannels, np.int64)
+        # histogram of raw >> _hist_shift, from the bin _hist_start
+        self._hist_shift = 0
+        self._hist_start = 0
+        self.hist = np.zeros((nchannels, 0), np.int64)
+
+    def update(self, block):
+        if not len(block):
+            return
+        block = block.reshape(len(block), self.nchannels)
+        n = len(block)
+        low, high = block.min(axis=0), block.max(axis=0)
+        self.min = np.minimum(self.min, low)
+        self.max = np.maximum(self.max, high)
+        x = block.astype(np.float64)
+        mean = x.mean(axis=0)
+        x -= mean
+        np.square(x, out=x)
+        self._combine(n, mean, x.sum(axis=0))
+        self.clipped += np.count_nonzero((block <= self.clip[0]) | (block >= self.clip[1]), axis=0)
+        if self._scale == 1:
+            raw = block.astype(np.int64)
+        else:
+            raw = np.floor(np.clip(block * self._scale, -2.0 ** 62, 2.0 ** 62)).astype(np.int64)
+        self._cover(int(raw.min()), int(raw.max()))
+        bins = (raw >> self._hist_shift) - self._hist_start
+        for ch in range(self.nchannels):
+            self.hist[ch] += np.bincount(bins[:, ch], minlength=self.hist.shape[1])
+
+    def merge(self, other):
+        """Add the statistics of other (same type and calibration)"""
+        if (other.nchannels, other.dtype, other.zero, other.factor) != \
+                (self.nchannels, self.dtype, self.zero, self.factor):
+            raise Error('cannot merge statistics of different signals')
+        if not other.count:
+            return self
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self._combine(other.count, other.mean, other.m2)
+        self.clipped += other.clipped
+        while self._hist_shift < other._hist_shift:
+            self._coarsen()
+        hist, start = other.hist, other._hist_start
+        for i in range(self._hist_shift - other._hist_shift):
+            if start & 1:
+                hist = np.pad(hist, ((0, 0), (1, 0)))
+                start -= 1
+            if hist.shape[1] & 1:
+                hist = np.pad(hist, ((0, 0), (0, 1)))
+            hist = hist.reshape(self.nchannels, -1, 2).sum(axis=2)
+            start >>= 1
+        self._cover(start << self._hist_shift, (start + hist.shape[1] - 1) << self._hist_shift)
+        i = start - self._hist_start
+        self.hist[:, i:i + hist.shape[1]] += hist
+        return self
+
+    def _cover(self, low, high):
+        # extend the histogram to the raw values [low, high]
+        if self.hist.shape[1]:
+            low = min(low, self._hist_start << self._hist_shift)
+            high = max(high, (self._hist_start + self.hist.shape[1] - 1) << self._hist_shift)
+        else:
+            self._hist_start = low >> self._hist_shift
+        while (high >> self._hist_shift) - (low >> self._hist_shift) >= _STATS_BINS:
+            self._coarsen()
+        first, last = low >> self._hist_shift, high >> self._hist_shift
+        self.hist = np.pad(self.hist, ((0, 0), (self._hist_start - first,
+                                                last - self._hist_start - self.hist.shape[1] + 1)))
+        self._hist_start = first
+
+    def _coarsen(self):
+        # double the width of the bins
+        if self._hist_start & 1:
+            self.hist = np.pad(self.hist, ((0, 0), (1, 0)))
+            self._hist_start -= 1
+        if self.hist.shape[1] & 1:
+            self.hist = np.pad(self.hist, ((0, 0), (0, 1)))
+        self.hist = self.hist.reshape(self.nchannels, -1, 2).sum(axis=2)
+        self._hist_start >>= 1
+        self._hist_shift += 1
+
+    def _combine(self, n, mean, m2):
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (n / total)
+        self.m2 = self.m2 + m2 + delta ** 2 * (self.count * n / total)
+        self.count = total
+
+    def _calibrate(self, raw):
+        return (np.asarray(raw, np.float64) - self.zero) * self.factor
+
+    def percentile(self, q):
+        """Return the q-th percentiles (nearest rank) of each channel"""
+        if not self.count:
+            return np.full(self.nchannels, np.nan)
+        rank = max(1, int(np.ceil(q / 100.0 * self.count)))
+        if self.factor < 0:
+            # the calibration reverses the order of the raw values
+            rank = self.count + 1 - rank
+        cumulative = np.cumsum(self.hist, axis=1)
+        bins = np.array([np.searchsorted(c, rank) for c in cumulative]) + self._hist_start
+        width = 1 << self._hist_shift
+        return self._calibrate(((bins << self._hist_shift) + (width - 1) / 2.0) / self._scale)
+
+    def summary(self, percentiles=(1, 5, 25, 50, 75, 95, 99)):
+        """Return a dict of lists (one value per channel): count, min, max,
+        mean, std, rms, clipping (ratio of clipped samples) and pq for
+        each q in percentiles"""
+        if self.count:
+            bounds = self._calibrate(self.min), self._calibrate(self.max)
+            mean = self._calibrate(self.mean)
+            std = np.sqrt(self.m2 / self.count) * abs(self.factor)
+            clipping = self.clipped / float(self.count)
+        else:
+            nan = np.full(self.nchannels, np.nan)
+            bounds, mean, std, clipping = (nan, nan), nan, nan, nan
+        result = {'count': [self.count] * self.nchannels,
+                  'min': np.minimum(*bounds).tolist(),
+                  'max': np.maximum(*bounds).tolist(),
+                  'mean': mean.tolist(),
+                  'std': std.tolist(),
+                  'rms': np.sqrt(std ** 2 + mean ** 2).tolist(),
+                  'clipping': clipping.tolist()}
+        for q in percentiles:
+            result['p%g' % q] = self.percentile(q).tolist()
+        return result
+
+
+def _unpack24(data):
+    """Decode packed little-endian 24-bit samples into an int32 array"""
+    packed = np.frombuffer(data, np.uint8).reshape(-1, 3)
+    # each sample in the 3 high bytes of an int32: the arithmetic shift
+    # extends its sign
+    samples = np.zeros((len(packed), 4), np.uint8)
+    samples[:, 1:] = packed
+    return (samples.view('<i4')[:, 0] >> 8).astype(np.int32, copy=False)
+
+
+def _pack24(samples):
+    """Encode int32 samples as packed little-endian 24-bit bytes"""
+    samples = np.ascontiguousarray(samples, '<i4').reshape(-1, 1)
+    return samples.view(np.uint8)[:, :3].tobytes()
+
+
+def _iterblocks(readinto, buffer, overlap):
+    """Generate the blocks filled in buffer by readinto(out), which
+    returns the number of frames written at the start of out."""
+    blocksize = len(buffer)
+    if not 0 <= overlap < blocksize:
+        raise ValueError('overlap must be in [0, blocksize)')
+
+    def blocks():
+        filled = 0
+        while 1:
+            n = readinto(buffer[filled:])
+            if not n:
+                break
+            filled += n
+            yield buffer[:filled]
+            if filled < blocksize:
+                break
+            if overlap:
+                buffer[:overlap] = buffer[blocksize - overlap:]
+            filled = overlap
+
+    return blocks()
+
+
+_session_exts = ('int', 'oaf', 'naf', 'pr1', 'pr2')
+
+
+class Session:
+    """Simultaneous recordings of a session, read together.
+
+        s = wsig.Session('example/example')
+
+    opens the sibling files example/example.int, .oaf, .naf, .pr1 and
+    .pr2 which exist (or, if extensions is given, all the files
+    basename.ext for ext in extensions). All the signals must have the
+    same frame rate and the same number of frames; if strict is false,
+    signals of different lengths are allowed and the session is
+    truncated to the shortest one.
+
+    Calibrated frames of all signals are read together as one array of
+    shape (frames, nsignals), with one column per channel of each file,
+    in the order of the extensions.
+    """
+
+    def __init__(self, basename, extensions=None, strict=True):
+        if extensions is None:
+            extensions = [ext for ext in _session_exts
+                          if os.path.exists(basename + '.' + ext)]
+            if not extensions:
+                raise Error('no recording found for %r' % basename)
+        self._readers = []
+        try:
+            for ext in extensions:
+                self._readers.append(WsigRead(basename + '.' + ext))
+            self._initsession(strict)
+        except:
+            self.close()
+            raise
+        self._files = [basename + '.' + ext for ext in extensions]
+
+    def _initsession(self, strict):
+        self._framerate = self._readers[0].getframerate()
+        for r in self._readers:
+            if r.getframerate() != self._framerate:
+                raise Error('frame rates differ: %r' % [r.getframerate() for r in self._readers])
+        lengths = [r.getnframes() for r in self._readers]
+        if strict and min(lengths) != max(lengths):
+            raise Error('numbers of frames differ: %r' % lengths)
+        self._nframes = min(lengths)
+        self._nsignals = sum(r.getnchannels() for r in self._readers)
+        self._soundpos = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        for r in self._readers:
+            r.close()
+
+    def getreaders(self):
+        return list(self._readers)
+
+    def getfiles(self):
+        return list(self._files)
+
+    def getnsignals(self):
+        return self._nsignals
+
+    def getnframes(self):
+        return self._nframes
+
+    def getframerate(self):
+        return self._framerate
+
+    def getduration(self):
+        return self._nframes / float(self._framerate)
+
+    def getparanames(self):
+        return [r.getparaname() for r in self._readers for i in range(r.getnchannels())]
+
+    def getunits(self):
+        return [r.getunit() for r in self._readers for i in range(r.getnchannels())]
+
+    def tell(self):
+        return self._soundpos
+
+    def rewind(self):
+        self.setpos(0)
+
+    def setpos(self, pos):
+        if pos < 0 or pos > self._nframes:
+            raise Error('position not in range')
+        for r in self._readers:
+            r.setpos(pos)
+        self._soundpos = pos
+
+    def readcalibrated(self, nframes, dtype=np.float32, out=None):
+        """Read at most nframes time-aligned frames of every signal and
+        return them calibrated, as an array of shape (frames, nsignals).
+        If out is given, the frames are calibrated in place into it, as
+        by WsigRead.readcalibrated().
+        """
+        remaining = self._nframes - self._soundpos
+        if nframes < 0 or nframes > remaining:
+            nframes = remaining
+        if out is None:
+            out = np.empty((nframes, self._nsignals), dtype)
+        else:
+            if out.ndim != 2 or out.shape[1] != self._nsignals:
+                raise ValueError('out must have shape (frames, %d)' % self._nsignals)
+            nframes = min(nframes, len(out))
+        n = nframes
+        col = 0
+        for r in self._readers:
+            nch = r.getnchannels()
+            n = min(n, len(r.readcalibrated(nframes, out=out[:nframes, col:col + nch])))
+            col += nch
+        self._soundpos += n
+        return out[:n]
+
+    def iterblocks(self, blocksize, overlap=0, dtype=np.float32):
+        """Generate successive calibrated blocks of shape (frames, nsignals)
+        as WsigRead.iterblocks(), from a single reused buffer."""
+        if blocksize <= 0:
+            raise ValueError('blocksize must be positive')
+        buffer = np.empty((blocksize, self._nsignals), dtype)
+        return _iterblocks(lambda out: len(self.readcalibrated(-1, out=out)), buffer, overlap)
+
+    def iterwindows(self, duration, overlap=0.0, dtype=np.float32):
+        """Same as iterblocks(), with the window duration and the overlap
+        given in seconds."""
+        blocksize = int(round(duration * self._framerate))
+        overlap = int(round(overlap * self._framerate))
+        return self.iterblocks(blocksize, overlap, dtype)
+
+
+class Envelope:
+    """Multi-resolution min/max envelope of a recording, for plotting.
+
+        env = wsig.Envelope(filename)
+        time, lo, hi = env.get(t0, t1, npoints)
+
+    Level k of the pyramid holds the minimum and the maximum of every bin
+    of binsize * factor**k frames (calibrated if calibrated is true). It
+    is built in one streaming pass over the file and cached in the
+    sidecar file filename + '.env.npz', which is rebuilt when the size or
+    the mtime of the recording changes (cache=False disables it).
+    """
+
+    def __init__(self, filename, calibrated=True, binsize=16, factor=4, cache=True):
+        if binsize < 1 or factor < 2:
+            raise ValueError('binsize must be >= 1 and factor >= 2')
+        self._filename = filename
+        self._calibrated = bool(calibrated)
+        self._binsize = binsize
+        self._factor = factor
+        st = os.stat(filename)
+        self._key = np.array([st.st_size, st.st_mtime_ns, self._calibrated, binsize, factor], np.int64)
+        sidecar = filename + '.env.npz'
+        if cache and self._load(sidecar):
+            return
+        self._build()
+        if cache:
+            self._save(sidecar)
+
+    def getframerate(self):
+        return self._framerate
+
+    def getnframes(self):
+        return self._nframes
+
+    def get(self, t0=0.0, t1=None, npoints=2000):
+        """Return (time, lo, hi) for the time range [t0, t1) (in seconds,
+        t1=None for the end of the signal): at most npoints bins, with the
+        start time of each bin and the min and max of its frames as
+        arrays of shape (bins, nchannels). Ranges of at most npoints
+        frames are returned sample by sample (lo == hi).
+        """
+        start = min(max(0, int(np.floor(t0 * self._framerate))), self._nframes)
+        if t1 is None:
+            stop = self._nframes
+        else:
+            stop = min(max(start, int(np.ceil(t1 * self._framerate))), self._nframes)
+        if stop - start <= npoints:
+            with WsigRead(self._filename) as w:
+                data = np.asarray(w.read_range(start, stop, self._calibrated), np.float32)
+            return np.arange(start, stop) / float(self._framerate), data, data
+        binsize = self._binsize
+        for lo, hi in zip(self._lo, self._hi):
+            first, last = start // binsize, -(-stop // binsize)
+            if last - first <= npoints or len(lo) == 1:
+                break
+            binsize *= self._factor
+        time = np.arange(first, last) * (binsize / float(self._framerate))
+        return time, lo[first:last], hi[first:last]
+
+    def trace(self, t0=0.0, t1=None, npoints=2000):
+        """Return (time, y) where y alternates the min and the max of
+        each bin returned by get(), ready to be drawn as one line."""
+        time, lo, hi = self.get(t0, t1, npoints)
+        y = np.empty((2 * len(lo), lo.shape[1]), lo.dtype)
+        y[0::2] = lo
+        y[1::2] = hi
+        return np.repeat(time, 2), y
+
+    def _build(self):
+        with WsigRead(self._filename) as w:
+            self._framerate = w.getframerate()
+            self._nframes = w.getnframes()
+            nbins = max(1, -(-self._nframes // self._binsize))
+            lo = np.zeros((nbins, w.getnchannels()), np.float32)
+            hi = np.zeros((nbins, w.getnchannels()), np.float32)
+            i = 0
+            for block in w.iterblocks(self._binsize * 4096, calibrated=self._calibrated):
+                bins = np.arange(0, len(block), self._binsize)
+                lo[i:i + len(bins)] = np.minimum.reduceat(block, bins)
+                hi[i:i + len(bins)] = np.maximum.reduceat(block, bins)
+                i += len(bins)
+        self._lo = [lo]
+        self._hi = [hi]
+        while len(lo) > 1:
+            bins = np.arange(0, len(lo), self._factor)
+            lo = np.minimum.reduceat(lo, bins)
+            hi = np.maximum.reduceat(hi, bins)
+            self._lo.append(lo)
+            self._hi.append(hi)
+
+    def _load(self, sidecar):
+        try:
+            with np.load(sidecar) as npz:
+                if not np.array_equal(npz['key'], self._key):
+                    return False
+                self._framerate = int(npz['framerate'])
+                self._nframes = int(npz['nframes'])
+                nlevels = int(npz['nlevels'])
+                self._lo = [npz['lo%d' % k] for k in range(nlevels)]
+                self._hi = [npz['hi%d' % k] for k in range(nlevels)]
+        except (OSError, KeyError, ValueError):
+            return False
+        return True
+
+    def _save(self, sidecar):
+        levels = {}
+        for k in range(len(self._lo)):
+            levels['lo%d' % k] = self._lo[k]
+            levels['hi%d' % k] = self._hi[k]
+        tmp = sidecar + '.tmp'
+        try:
+            with builtins.open(tmp, 'wb') as f:
+                np.savez(f, key=self._key, framerate=self._framerate, nframes=self._nframes,
+                         nlevels=len(self._lo), **levels)
+            os.replace(tmp, sidecar)
+        except OSError:
+            # read-only archive: keep the envelope in memory only
+            pass
+
+
+def read(f, mode=None):
+    if mode is None:
+        if hasattr(f, 'mode'):
+            mode = f.mode
+        else:
+            mode = 'rb'
+    if mode in ('r', 'rb'):
+        return WsigRead(f)
+    else:
+        raise Error("mode must be 'r', or, 'rb'")
+
+
+def memmap(f):
+    """Map the samples of a SESANE or WAVE file without reading them.
+
+    The returned read-only numpy.memmap (shape (nframes, nchannels))
+    stays valid after the file itself has been closed.
+    """
+    with WsigRead(f) as w:
+        return w.asarray()
+
+
+_INDEX_NAME = '.wsig_index.sqlite'
+_INDEX_SCHEMA = """CREATE TABLE IF NOT EXISTS recordings (
+    path TEXT PRIMARY KEY,
+    ext TEXT,
+    size INTEGER,
+    mtime INTEGER,
+    filetype TEXT,
+    nchannels INTEGER,
+    sampwidth INTEGER,
+    framerate INTEGER,
+    nframes INTEGER,
+    duration REAL,
+    paraname TEXT,
+    unit TEXT,
+    signaldynamic REAL,
+    valueatmax REAL,
+    zero REAL,
+    error TEXT
+)"""
+_index_params = ('nchannels', 'sampwidth', 'framerate', 'nframes', 'duration',
+                 'paraname', 'unit', 'signaldynamic', 'valueatmax', 'zero')
+_scan_pattern = re.compile(r'.+\.(int|naf|oaf|pr1|pr2|wav)$', re.IGNORECASE)
+
+
+def scan(directory, index=None, pattern=_scan_pattern):
+    """Index the headers of all the recordings found under directory.
+
+    Only the headers are parsed, the data chunks are never read. The
+    index is a SQLite database (by default .wsig_index.sqlite in
+    directory) with one row per file in the table recordings:
+        path, ext, size, mtime, filetype, nchannels, sampwidth,
+        framerate, nframes, duration, paraname, unit,
+        signaldynamic, valueatmax, zero, error
+    where error is the reason why a file could not be parsed (NULL
+    otherwise). Files whose size and mtime are unchanged since the
+    previous scan are not parsed again; rows of removed files are
+    deleted.
+
+    Returns the open sqlite3.Connection, e.g.
+        index = wsig.scan('archive')
+        index.execute("SELECT path FROM recordings WHERE ext = 'pr1' "
+                      "AND duration > 60 AND framerate = 2000")
+    """
+    if index is None:
+        index = os.path.join(directory, _INDEX_NAME)
+    if isinstance(pattern, str):
+        pattern = re.compile(pattern)
+    db = sqlite3.connect(index)
+    db.row_factory = sqlite3.Row
+    db.execute(_INDEX_SCHEMA)
+    known = {row['path']: (row['size'], row['mtime'])
+             for row in db.execute('SELECT path, size, mtime FROM recordings')}
+    root = os.path.abspath(directory)
+    seen = set()
+    with db:
+        for path, subdirs, files in os.walk(root):
+            for name in files:
+                if not pattern.match(name):
+                    continue
+                filename = os.path.join(path, name)
+                try:
+                    st = os.stat(filename)
+                except OSError:
+                    continue
+                seen.add(filename)
+                if known.get(filename) == (st.st_size, st.st_mtime_ns):
+                    continue
+                row = dict(path=filename, ext=os.path.splitext(name)[1][1:].lower(),
+                           size=st.st_size, mtime=st.st_mtime_ns, filetype=None, error=None)
+                row.update(dict.fromkeys(_index_params))
+                try:
+                    with WsigRead(filename) as w:
+                        params = w.getparams()
+                        row['filetype'] = w._filetype.decode('ascii')
+                except (Error, EOFError, OSError, UnicodeDecodeError) as e:
+                    row['error'] = str(e) or type(e).__name__
+                else:
+                    row.update((name, getattr(params, name)) for name in _index_params)
+                db.execute('INSERT OR REPLACE INTO recordings (%s) VALUES (%s)'
+                           % (', '.join(row), ', '.join('?' * len(row))), tuple(row.values()))
+        prefix = os.path.join(root, '')
+        db.executemany('DELETE FROM recordings WHERE path = ?',
+                       [(path,) for path in known if path.startswith(prefix) and path not in seen])
+    return db
+
+
+_verify_result = namedtuple('_verify_result', 'path ok filetype size chunks errors warnings')
+
+
+def verify(paths, workers=None):
+    """Check the structure of the SESANE or WAVE files paths (a list, or
+    a single file name) reading their headers only, workers files at a
+    time (default: as many as concurrent.futures.ThreadPoolExecutor).
+
+    Returns one namedtuple per file, in the order of paths:
+        path, ok -- ok is true if no error was found
+        filetype -- 'WSIG', 'WAVE' or None
+        size -- size of the file
+        chunks -- list of (name, offset, size) of the chunks
+        errors -- list of the errors: unreadable header, RIFF or chunk
+                  extending beyond the end of the file, numbers of
+                  samples of sdsc / adsc which differ from the data
+                  chunk, null signal dynamic
+        warnings -- list of the oddities which do not prevent reading:
+                    bytes after the RIFF chunk, data chunk which is not a
+                    whole number of frames
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+        return list(executor.map(_verify, paths))
+
+
+def _verify(path):
+    errors = []
+    warnings = []
+    chunks = []
+    filetype = size = None
+    try:
+        with builtins.open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            head = f.read(12)
+            if len(head) < 12 or head[:4] != b'RIFF':
+                raise Error('File does not start with RIFF id')
+            filetype = head[8:12].decode('latin-1')
+            end = 8 + struct.unpack_from('<L', head, 4)[0]
+            if end > size:
+                errors.append('RIFF size %d exceeds the file size %d' % (end, size))
+            elif end < size:
+                warnings.append('%d bytes after the RIFF chunk' % (size - end))
+            pos = 12
+            while pos + 8 <= min(end, size):
+                f.seek(pos)
+                name, chunksize = struct.unpack('<4sL', f.read(8))
+                name = name.decode('latin-1')
+                chunks.append((name, pos, chunksize))
+                if pos + 8 + chunksize > size:
+                    errors.append('%s chunk at %d extends %d bytes beyond the end of the file'
+                                  % (name, pos, pos + 8 + chunksize - size))
+                pos += 8 + chunksize + (chunksize & 1)
+        with WsigRead(path) as w:
+            if w._data_size % w._framesize:
+                warnings.append('data chunk of %d bytes is not a whole number of %d-byte frames'
+                                % (w._data_size, w._framesize))
+            if w._filetype == b'WSIG':
+                nframes = w.getnframes()
+                for chunk, n in (('sdsc', w._snsamples), ('adsc', w._ansamples)):
+                    if n is not None and n != nframes and n != nframes * w.getnchannels():
+                        errors.append('%s gives %d samples, the data chunk holds %d frames'
+                                      % (chunk, n, nframes))
+                if not w.getsignaldynamic():
+                    errors.append('null signal dynamic (cmax == czero)')
+    except (Error, EOFError, OSError, UnicodeDecodeError, struct.error) as e:
+        errors.append(str(e) or type(e).__name__)
+    return _verify_result(path, not errors, filetype, size, chunks, errors, warnings)
+
+
+class _RiffWriter:
+    """Common part of WaveWriter and WsigWriter: frames are written block
+    by block after a header computed from the expected number of frames,
+    which is rewritten on close() if the number of frames actually
+    written differs."""
+
+    def _initwriter(self, f, nchannels, dtype, nframes, sampwidth):
+        self._file = None
+        self._dtype = None
+        self._sampwidth = sampwidth
+        if sampwidth == 3:
+            dtype = np.int32
+        if dtype is not None:
+            self._setdtype(np.dtype(dtype))
+        self._nchannels = nchannels
+        self._nframes = nframes
+        self._datawritten = 0
+        self._headerwritten = False
+        self._iostats = dict.fromkeys(_IOSTATS, 0)
+        self._i_opened_the_file = None
+        if isinstance(f, str):
+            f = builtins.open(f, 'wb')
+            self._i_opened_the_file = f
+        self._file = f
+
+    def __del__(self):
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def tell(self):
+        return self._datawritten // (self._nchannels * self._sampwidth) if self._dtype else 0
+
+    def getiostats(self):
+        """Return the I/O counters of this writer (see wsig.getiostats())"""
+        return dict(self._iostats)
+
+    def writeframes(self, data):
+        """Write a 1-D (mono) or 2-D (frames, nchannels) numpy array"""
+        data = np.asarray(data)
+        if self._dtype is None:
+            self._setdtype(data.dtype)
+        if data.ndim == 1:
+            data = data.reshape(-1, 1)
+        if data.ndim != 2 or data.shape[1] != self._nchannels:
+            raise ValueError('data must have shape (frames, %d)' % self._nchannels)
+        data = np.ascontiguousarray(data, self._dtype)
+        if self._sampwidth == 3:
+            data = np.frombuffer(_pack24(data), np.uint8)
+        if self._datawritten + data.nbytes > self._maxdata():
+            raise Error('data chunk exceeds 4 GB (RF64 not supported)')
+        if not self._headerwritten:
+            self._write_header()
+        self._write(data.reshape(-1).view('b').data)
+        self._datawritten += data.nbytes
+
+    def close(self):
+        file = self._file
+        if not file:
+            return
+        try:
+            if self._dtype is None:
+                self._setdtype(np.dtype(np.int16))
+            if not self._headerwritten:
+                self._write_header()
+            if self._datawritten & 1:
+                self._write(b'\x00')
+            trailer = self._trailer()
+            if trailer:
+                self._write(trailer)
+            if self._datawritten != self._nframes * self._nchannels * self._sampwidth:
+                end = file.tell()
+                file.seek(self._header_offset)
+                self._write(self._header(self.tell()))
+                file.seek(end)
+                if _instrumented:
+                    _count(self._iostats, seeks=2)
+            file.flush()
+        finally:
+            self._file = None
+            if self._i_opened_the_file:
+                self._i_opened_the_file = None
+                file.close()
+
+    def _write(self, data):
+        if not _instrumented:
+            return self._file.write(data)
+        start = time.perf_counter()
+        self._file.write(data)
+        _count(self._iostats, write_calls=1, bytes_written=len(data),
+               write_time=time.perf_counter() - start)
+
+    def _setdtype(self, dtype):
+        dkind = dtype.kind
+        if not (dkind == 'i' or dkind == 'f' or (dkind == 'u' and dtype.itemsize == 1)):
+            raise ValueError("Unsupported data type '%s'" % dtype)
+        if self._sampwidth is None:
+            self._sampwidth = dtype.itemsize
+        elif self._sampwidth != dtype.itemsize and not (self._sampwidth == 3 and dkind == 'i'):
+            raise ValueError('sample width %d does not match data type %s' % (self._sampwidth, dtype))
+        self._dtype = dtype.newbyteorder('<')
+
+    def _write_header(self):
+        if self._nframes * self._nchannels * self._sampwidth > self._maxdata():
+            raise Error('data chunk exceeds 4 GB (RF64 not supported)')
+        try:
+            self._header_offset = self._file.tell()
+        except (AttributeError, OSError):
+            self._header_offset = 0
+        self._write(self._header(self._nframes))
+        self._headerwritten = True
+
+    def _trailer(self):
+        # chunks written after the data chunk
+        return b''
+
+
+class WaveWriter(_RiffWriter):
+    """Write a WAVE file block by block, in a single sequential pass.
+
+        with wsig.WaveWriter(file, rate, nchannels) as w:
+            for block in blocks:
+                w.writeframes(block)
+
+    file -- name of the file or open file object with a write() method
+    rate -- sample rate (in samples/sec)
+    nchannels -- number of channels of the frames written
+    dtype -- numpy data-type of the samples: integer types are written as
+             PCM, float types as IEEE float. If omitted, the data-type
+             of the first block written is used.
+    nframes -- expected number of frames. The RIFF and data sizes are
+               written in the header from it and patched on close() if
+               the number of frames actually written differs, which
+               then needs a seekable file.
+    sampwidth -- sample width in the file, in bytes: only needed for
+                 24-bit PCM (sampwidth=3), written from int32 samples
+
+    WAVE sizes are stored on 32 bits: writing more than 4 GB of samples
+    raises an Error (RF64 is not supported).
+    """
+
+    def __init__(self, f, rate, nchannels=1, dtype=None, nframes=0, sampwidth=None):
+        self._rate = rate
+        self._initwriter(f, nchannels, dtype, nframes, sampwidth)
+
+    def _maxdata(self):
+        return _WAVE_MAX_DATA
+
+    def _header(self, nframes):
+        size = nframes * self._nchannels * self._sampwidth
+        if self._dtype.kind == 'f':
+            comp = WAVE_FORMAT_IEEE_FLOAT
+        else:
+            comp = WAVE_FORMAT_PCM
+        bits = self._sampwidth * 8
+        ba = self._nchannels * self._sampwidth
+        return (b'RIFF' + struct.pack('<I', 36 + size + (size & 1)) + b'WAVE'
+                # fmt chunk
+                + b'fmt ' + struct.pack('<IHHIIHH', 16, comp, self._nchannels, self._rate,
+                                        self._rate * ba, ba, bits)
+                # data chunk
+                + b'data' + struct.pack('<I', size))
+
+
+class WsigWriter(_RiffWriter):
+    """Write a SESANE (WSIG) file block by block, in a single sequential pass.
+
+        with wsig.read(src) as r, wsig.WsigWriter(dst, like=r) as w:
+            for block in r.iterblocks(65536):
+                w.writeframes(block)
+
+    file -- name of the file or open file object with a write() method
+    rate, nchannels, sampwidth -- sample rate, number of channels and
+             sample width in bytes (1, 2, 3 or 4) of the frames written
+    nframes -- expected number of frames, as for WaveWriter
+    sdsc, adsc -- dicts (or namedtuples, as returned by getsdsc() and
+             getadsc()) of the fields of the sdsc and adsc chunks, e.g.
+             sdsc=dict(paraname='pressure', unitname='hPa', czero=0,
+             cmax=2048, imax=20, fmax=0). Missing fields get neutral
+             defaults (identity calibration); the fields describing the
+             frames (snsamples, sampfreq, nch, ansamples, bps) are set
+             by the writer.
+    listdata -- body of the LIST chunk (metadata), as returned by
+             getlistdata()
+    like -- a WsigRead whose rate, channels, sample width, number of
+            frames, sdsc, adsc and LIST are used for the arguments not
+            given: a file read and written again with the same frames
+            is identical
+
+    The chunks are written in the order of EVA: sdsc, adsc, data, LIST.
+    """
+
+    def __init__(self, f, rate=None, nchannels=None, sampwidth=None, nframes=None,
+                 sdsc=None, adsc=None, listdata=None, like=None):
+        self._file = None
+        if like is not None:
+            if like._filetype != b'WSIG':
+                raise Error('like must be a SESANE file')
+            rate = like.getframerate() if rate is None else rate
+            nchannels = like.getnchannels() if nchannels is None else nchannels
+            sampwidth = like.getsampwith() if sampwidth is None else sampwidth
+            nframes = like.getnframes() if nframes is None else nframes
+            if sdsc is None:
+                sdsc = like.getsdsc()._asdict()
+            if adsc is None and like.getadsc() is not None:
+                adsc = like.getadsc()._asdict()
+            listdata = like.getlistdata() if listdata is None else listdata
+        if rate is None:
+            raise TypeError('rate is required')
+        nchannels = nchannels or 1
+        sampwidth = sampwidth or 2
+        if sampwidth >= len(_numpy_fmts) or not _numpy_fmts[sampwidth]:
+            raise Error('unsupported sample width %d' % sampwidth)
+        dtype = np.dtype(_numpy_fmts[sampwidth])
+        if dtype.kind == 'u':
+            low, high = 0, 255
+        else:
+            low, high = -(1 << (8 * sampwidth - 1)), (1 << (8 * sampwidth - 1)) - 1
+        self._limits = low, high
+        # s_max and s_min are 16-bit fields
+        s_max, s_min = min(high, 0x7fff), max(low, -0x8000)
+        self._sdsc = _sdsc_params(128, 0, b'', b'', 0, rate, s_max, s_min, 1, 0, 1, 0)
+        self._sdsc = self._sdsc._replace(**dict(sdsc or {}))
+        # highest and lowest are 32-bit fields
+        self._adsc = _adsc_params(32, nchannels, 0, rate, 8 * sampwidth, high, low, 0, 0, 0)
+        self._adsc = self._adsc._replace(**dict(adsc or {}))
+        self._rate = rate
+        self._listdata = listdata
+        self._initwriter(f, nchannels, dtype, nframes or 0, sampwidth)
+
+    def writecalibrated(self, data):
+        """Write calibrated values (1-D or 2-D float array): they are
+        converted back to raw samples with the calibration of the sdsc
+        chunk, rounded and clipped to the sample type."""
+        s = self._sdsc
+        if s.cmax == s.czero:
+            raise Error('bad signal dynamic')
+        # as WsigRead: valueatmax / signaldynamic
+        factor = (float(s.imax) + s.fmax / float(100000)) / float(s.cmax - s.czero)
+        raw = np.rint(np.asarray(data, np.float64) / factor + s.czero)
+        self.writeframes(np.clip(raw, *self._limits))
+
+    def _maxdata(self):
+        return 0xffffffff - 4 - (8 + 128) - (8 + 32) - 8 - 1 - len(self._trailer())
+
+    def _header(self, nframes):
+        size = nframes * self._nchannels * self._sampwidth
+        s = self._sdsc._replace(snsamples=nframes, sampfreq=self._rate)
+        a = self._adsc._replace(nch=self._nchannels, ansamples=nframes, bps=8 * self._sampwidth)
+        for name in ('paraname', 'unitname'):
+            if isinstance(getattr(s, name), str):
+                s = s._replace(**{name: getattr(s, name).encode('ascii')})
+        sdsc = struct.pack(_SDSC_FORMAT, *s)
+        adsc = struct.pack(_ADSC_FORMAT, *a)
+        riffsize = 4 + (8 + len(sdsc)) + (8 + len(adsc)) + 8 + size + (size & 1) + len(self._trailer())
+        return (b'RIFF' + struct.pack('<L', riffsize) + b'WSIG'
+                + b'sdsc' + struct.pack('<L', len(sdsc)) + sdsc
+                + b'adsc' + struct.pack('<L', len(adsc)) + adsc
+                + b'data' + struct.pack('<L', size))
+
+    def _trailer(self):
+        # the LIST chunk, without pad byte at the end of the file as EVA
+        if self._listdata is None:
+            return b''
+        return b'LIST' + struct.pack('<L', len(self._listdata)) + bytes(self._listdata)
+
+
+def towave(filename, rate, data):
+    """
+    Write a numpy array as a WAV file
+    Parameters
+    ----------
+    filename : string or open file handle
+        Output wav file
+    rate : int
+        The sample rate (in samples/sec).
+    data : ndarray
+        A 1-D or 2-D numpy array of either integer or float data-type.
+    Notes
+    -----
+    * The file can be an open file or a filename.
+    * Writes a simple uncompressed WAV file.
+    * The bits-per-sample will be determined by the data-type.
+    * To write multiple-channels, use a 2-D array of shape
+      (Nsamples, Nchannels).
+    """
+    if data.ndim == 1:
+        noc = 1
+    else:
+        noc = data.shape[1]
+    with WaveWriter(filename, rate, noc, data.dtype, len(data)) as w:
+        w.writeframes(data)
+    if hasattr(filename, 'write'):
+        filename.seek(0)
@@ -0,0 +1,148 @@
+"""asyncio interface to the wsig module (import wsig.aio)
+
+Opening a file (which parses its header) and reading frames are blocking
+file operations: they run in a bounded thread pool shared by all the
+readers, so that the event loop is never blocked and at most limit()
+file operations run at the same time.
+
+    async def load(path):
+        async with await wsig.aio.open(path) as f:
+            return await f.readcalibrated(-1)
+
+    signals = await asyncio.gather(*[load(path) for path in paths])
+
+read_at() does not use the position of the reader: it is not serialized
+with the other operations of the reader. The methods which only return
+header information (getparams(), getframerate(), ...) and tell() are not
+coroutines, except getlistdata() and getmetainfo() which may read a LIST
+chunk stored after the frames.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import threading
+
+import numpy as np
+
+from . import read
+
+__all__ = ["open", "setlimit", "limit", "AsyncWsigRead"]
+
+_limit = 16
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def limit():
+    """Return the maximum number of concurrent file operations"""
+    return _limit
+
+
+def setlimit(n):
+    """Set the maximum number of concurrent file operations. Operations
+    already started finish in the previous pool."""
+    global _limit, _executor
+    if n < 1:
+        raise ValueError('limit must be positive')
+    with _executor_lock:
+        _limit = n
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(_limit, thread_name_prefix='wsig.aio')
+        return _executor
+
+
+async def _run(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(func, *args, **kwargs))
+
+
+async def open(f, mode=None):
+    """Coroutine returning an AsyncWsigRead for f, a file name or an open
+    file object, as wsig.read(); the header is parsed in the pool."""
+    return AsyncWsigRead(await _run(read, f, mode))
+
+
+class AsyncWsigRead:
+    """Awaitable wrapper of a WsigRead. Operations on the same reader are
+    serialized, operations on different readers run concurrently."""
+
+    def __init__(self, reader):
+        self._reader = reader
+        self._lock = asyncio.Lock()
+
+    def __getattr__(self, name):
+        # header information is already in memory
+        if name.startswith('get') or name == 'tell':
+            return getattr(self._reader, name)
+        raise AttributeError(name)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def _call(self, func, *args, **kwargs):
+        async with self._lock:
+            return await _run(func, *args, **kwargs)
+
+    async def close(self):
+        await self._call(self._reader.close)
+
+    async def setpos(self, pos):
+        async with self._lock:
+            self._reader.setpos(pos)
+
+    async def rewind(self):
+        async with self._lock:
+            self._reader.rewind()
+
+    async def readframes(self, nframes):
+        return await self._call(self._reader.readframes, nframes)
+
+    async def readcalibrated(self, nframes, dtype=np.float32, out=None):
+        return await self._call(self._reader.readcalibrated, nframes, dtype, out)
+
+    async def read_range(self, start, stop, calibrated=False, dtype=np.float32):
+        return await self._call(self._reader.read_range, start, stop, calibrated, dtype)
+
+    async def read_at(self, frame, nframes, calibrated=False, dtype=np.float32):
+        """WsigRead.read_at(): not serialized with the other operations,
+        several read_at() on the same reader run concurrently."""
+        return await _run(self._reader.read_at, frame, nframes, calibrated, dtype)
+
+    async def getlistdata(self):
+        return await self._call(self._reader.getlistdata)
+
+    async def getmetainfo(self):
+        return await self._call(self._reader.getmetainfo)
+
+    async def read_time_range(self, t0, t1, calibrated=False, dtype=np.float32):
+        return await self._call(self._reader.read_time_range, t0, t1, calibrated, dtype)
+
+    async def iterblocks(self, blocksize, overlap=0, calibrated=False, dtype=np.float32):
+        """Asynchronous generator of the blocks of WsigRead.iterblocks(),
+        each block being read in the pool. As with iterblocks(), blocks
+        are views of one buffer overwritten at the next step."""
+        blocks = self._reader.iterblocks(blocksize, overlap, calibrated, dtype)
+        while 1:
+            block = await self._call(next, blocks, None)
+            if block is None:
+                break
+            yield block
+
+    def iterwindows(self, duration, overlap=0.0, calibrated=False, dtype=np.float32):
+        """Same as iterblocks(), with the window duration and the overlap
+        given in seconds."""
+        framerate = self._reader.getframerate()
+        return self.iterblocks(int(round(duration * framerate)), int(round(overlap * framerate)),
+                               calibrated, dtype)
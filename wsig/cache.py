@@ -0,0 +1,159 @@
+"""Cache of open readers and decoded blocks (import wsig.cache)
+
+    cache = wsig.cache.Cache(maxhandles=32, maxbytes=64 << 20)
+    window = cache.read_time_range('session.pr1', 60.0, 62.0, calibrated=True)
+    cache.getstats()  # -> {'handle_hits': ..., 'block_hits': ..., ...}
+
+Readers are kept open in a pool of at most maxhandles files, so that the
+headers of a file are parsed once. The frames are decoded (and
+calibrated) by blocks of blocksize frames, kept in a least recently used
+cache of at most maxbytes bytes: a window requested again, or
+overlapping windows, are copied from memory without reading the file.
+
+Entries are keyed by the path, the mtime and the size of the file: a
+file which is modified is read again, and the entries of its previous
+version are discarded. A Cache can be shared between threads.
+"""
+
+import collections
+import os
+import threading
+
+import numpy as np
+
+from . import WsigRead
+
+__all__ = ["Cache"]
+
+_COUNTERS = ('handle_hits', 'handle_misses', 'block_hits', 'block_misses',
+             'handle_evictions', 'block_evictions')
+
+
+class Cache:
+    """Pool of WsigRead and LRU cache of decoded blocks.
+
+    maxhandles -- maximum number of files kept open
+    maxbytes -- maximum size of the decoded blocks kept in memory (the
+                most recent block is always kept)
+    blocksize -- number of frames per cached block
+    """
+
+    def __init__(self, maxhandles=32, maxbytes=64 << 20, blocksize=16384):
+        if maxhandles < 1 or blocksize < 1:
+            raise ValueError('maxhandles and blocksize must be positive')
+        self.maxhandles = maxhandles
+        self.maxbytes = maxbytes
+        self.blocksize = blocksize
+        self._handles = collections.OrderedDict()  # key -> reader
+        self._blocks = collections.OrderedDict()  # (key, calibrated, dtype, i) -> block
+        self._nbytes = 0
+        self._counters = dict.fromkeys(_COUNTERS, 0)
+        self._lock = threading.Lock()
+
+    def getstats(self):
+        """Return the hit / miss counters and the current size of the cache"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats.update(handles=len(self._handles), blocks=len(self._blocks), bytes=self._nbytes)
+        return stats
+
+    def getparams(self, path):
+        """Return the getparams() of the file path"""
+        return self._handle(self._key(path)).getparams()
+
+    def read_range(self, path, start, stop, calibrated=False, dtype=np.float32):
+        """Return the frames [start, stop) of the file path, as
+        WsigRead.read_range(). The array returned is a new copy."""
+        key = self._key(path)
+        return self._read(key, self._handle(key), start, stop, calibrated, dtype)
+
+    def read_time_range(self, path, t0, t1, calibrated=False, dtype=np.float32):
+        """Same as read_range(), with the range [t0, t1) in seconds."""
+        key = self._key(path)
+        reader = self._handle(key)
+        framerate = reader.getframerate()
+        return self._read(key, reader, int(round(t0 * framerate)), int(round(t1 * framerate)),
+                          calibrated, dtype)
+
+    def discard(self, path):
+        """Forget the reader and the blocks of the file path"""
+        path = os.path.abspath(path)
+        with self._lock:
+            self._discard(lambda key: key[0] == path)
+
+    def clear(self):
+        """Forget all the readers and blocks (the counters are kept)"""
+        with self._lock:
+            self._handles.clear()
+            self._blocks.clear()
+            self._nbytes = 0
+
+    def _key(self, path):
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        return path, st.st_mtime_ns, st.st_size
+
+    def _read(self, key, reader, start, stop, calibrated, dtype):
+        nframes = reader.getnframes()
+        start = min(max(0, start), nframes)
+        stop = min(max(start, stop), nframes)
+        dtype = np.dtype(dtype) if calibrated else reader._dtype()
+        out = np.empty((stop - start, reader.getnchannels()), dtype)
+        pos = start
+        while pos < stop:
+            i, offset = divmod(pos, self.blocksize)
+            block = self._block(key, reader, i, calibrated, dtype)[offset:offset + stop - pos]
+            out[pos - start:pos - start + len(block)] = block
+            pos += len(block)
+        return out
+
+    def _discard(self, match):
+        # called with the lock held; evicted readers are closed when the
+        # threads still reading them are done (WsigRead.__del__)
+        for key in [key for key in self._handles if match(key)]:
+            del self._handles[key]
+        for bkey in [bkey for bkey in self._blocks if match(bkey[0])]:
+            self._nbytes -= self._blocks.pop(bkey).nbytes
+
+    def _handle(self, key):
+        with self._lock:
+            reader = self._handles.get(key)
+            if reader is not None:
+                self._handles.move_to_end(key)
+                self._counters['handle_hits'] += 1
+                return reader
+            self._counters['handle_misses'] += 1
+        # parse the header without blocking the other files
+        reader = WsigRead(key[0])
+        with self._lock:
+            if key in self._handles:
+                # opened by another thread meanwhile
+                return self._handles[key]
+            # previous versions of the file
+            self._discard(lambda other: other[0] == key[0] and other != key)
+            self._handles[key] = reader
+            while len(self._handles) > self.maxhandles:
+                self._handles.popitem(last=False)
+                self._counters['handle_evictions'] += 1
+        return reader
+
+    def _block(self, key, reader, i, calibrated, dtype):
+        bkey = (key, bool(calibrated), dtype.str, i)
+        with self._lock:
+            block = self._blocks.get(bkey)
+            if block is not None:
+                self._blocks.move_to_end(bkey)
+                self._counters['block_hits'] += 1
+                return block
+            self._counters['block_misses'] += 1
+        # read_at() can be called by several threads on the same reader
+        block = reader.read_at(i * self.blocksize, self.blocksize, calibrated, dtype)
+        block.flags.writeable = False
+        with self._lock:
+            if bkey not in self._blocks:
+                self._blocks[bkey] = block
+                self._nbytes += block.nbytes
+                while self._nbytes > self.maxbytes and len(self._blocks) > 1:
+                    self._nbytes -= self._blocks.popitem(last=False)[1].nbytes
+                    self._counters['block_evictions'] += 1
+        return block
@@ -0,0 +1,94 @@
+"""Detection of events above a threshold (import wsig.events)
+
+    intervals = wsig.events.segment('session.oaf', high=0.2, low=0.1, mindur=0.05)
+    # -> array of shape (events, 2): onset and offset times in seconds
+
+An event starts at the first frame at or above high and ends at the
+first frame below low (hysteresis: the signal may go back between low
+and high without ending the event); events shorter than mindur seconds
+are dropped. The signal is processed block by block with vectorized
+edge detection, the state of the detector being carried from one block
+to the next, so that the events do not depend on the block size.
+"""
+
+import numpy as np
+
+from . import read
+
+__all__ = ["segment", "Segmenter"]
+
+
+class Segmenter:
+    """Detect events in successive blocks of a signal sampled at framerate.
+
+    Blocks are 1-D arrays or arrays of shape (frames, nchannels), of which
+    the column channel is used (in the units of high and low, e.g.
+    calibrated values). process() returns the events which ended in the
+    block, flush() the event still open at the end of the signal.
+    """
+
+    def __init__(self, framerate, high, low=None, mindur=0.0, channel=0):
+        if low is None:
+            low = high
+        if low > high:
+            raise ValueError('low must not be greater than high')
+        self.framerate = framerate
+        self.high = high
+        self.low = low
+        self.channel = channel
+        self._minframes = int(round(mindur * framerate))
+        self.reset()
+
+    def reset(self):
+        """Forget the frames already processed"""
+        self._pos = 0
+        self._active = False
+        self._start = 0
+
+    def process(self, block):
+        """Feed a block of frames and return the events which ended in
+        it, as an array of shape (events, 2) of onset and offset times"""
+        x = np.asarray(block)
+        if x.ndim > 1:
+            x = x[:, self.channel]
+        n = len(x)
+        if not n:
+            return np.zeros((0, 2))
+        above = x >= self.high
+        triggered = above | (x < self.low)
+        # state of each frame: that of the last frame out of [low, high)
+        last = np.maximum.accumulate(np.where(triggered, np.arange(n), -1))
+        state = np.where(last >= 0, above[last], self._active)
+        edges = np.flatnonzero(np.diff(state, prepend=self._active)) + self._pos
+        if self._active:
+            edges = np.concatenate([[self._start], edges])
+        self._active = len(edges) % 2 == 1
+        if self._active:
+            self._start = edges[-1]
+            edges = edges[:-1]
+        self._pos += n
+        return self._intervals(edges.reshape(-1, 2))
+
+    def flush(self):
+        """Return the event still open at the end of the signal (ended at
+        the last frame) and reset the segmenter"""
+        edges = np.array([[self._start, self._pos]] if self._active else [], np.int64)
+        self.reset()
+        return self._intervals(edges.reshape(-1, 2))
+
+    def _intervals(self, edges):
+        edges = edges[edges[:, 1] - edges[:, 0] >= max(1, self._minframes)]
+        return edges / float(self.framerate)
+
+
+def segment(f, high, low=None, mindur=0.0, channel=0, calibrated=True, blocksize=1 << 20):
+    """Return the events of the file f (a file name or an open file) as an
+    array of shape (events, 2) of onset and offset times in seconds.
+    Values are compared to high and low after calibration if calibrated
+    is true (see Segmenter)."""
+    with read(f) as w:
+        segmenter = Segmenter(w.getframerate(), high, low, mindur, channel)
+        events = [segmenter.process(block)
+                  for block in w.iterblocks(blocksize, calibrated=calibrated)]
+        events.append(segmenter.flush())
+    return np.concatenate(events)
@@ -0,0 +1,159 @@
+"""Fixed-length windows of many recordings, for training models
+(import wsig.loader)
+
+    dataset = wsig.loader.WindowDataset(files, window=4000, hop=2000)
+    for batch in wsig.loader.WindowLoader(dataset, batchsize=64, seed=0):
+        ...  # batch: array of shape (64, 4000, nchannels), calibrated
+
+The windows of all the files are numbered once, from the headers only,
+in a global index: window i is located by a binary search in the
+cumulative number of windows per file. The samples are read from
+memory-mapped data chunks, a batch being gathered with one copy per
+window and calibrated in place for the whole batch. WindowLoader builds
+the next batches in background threads while the current one is used.
+"""
+
+import collections
+import concurrent.futures
+import threading
+
+import numpy as np
+
+from . import Error, WsigRead
+
+__all__ = ["WindowDataset", "WindowLoader"]
+
+
+class WindowDataset:
+    """Windows of window frames, every hop frames, of all the files.
+
+    All the files must have the same number of channels. Windows are
+    calibrated into dtype if calibrated is true (WAVE files are only
+    converted). At most maxopen files are mapped at the same time (each
+    map holds a file descriptor); 24-bit files cannot be mapped.
+    """
+
+    def __init__(self, files, window, hop=None, calibrated=True, dtype=np.float32, maxopen=256):
+        if window < 1:
+            raise ValueError('window must be positive')
+        self.files = list(files)
+        self.window = window
+        self.hop = hop or window
+        self.calibrated = calibrated
+        self.dtype = np.dtype(dtype)
+        self.maxopen = maxopen
+        self.nchannels = None
+        counts = np.zeros(len(self.files), np.int64)
+        self._zero = np.zeros(len(self.files))
+        self._factor = np.ones(len(self.files))
+        for i, path in enumerate(self.files):
+            with WsigRead(path) as w:
+                if self.nchannels is None:
+                    self.nchannels = w.getnchannels()
+                elif w.getnchannels() != self.nchannels:
+                    raise Error('%s has %d channels instead of %d'
+                                % (path, w.getnchannels(), self.nchannels))
+                # frames which can be mapped (truncated files)
+                nframes = w._available_frames()
+                if nframes >= window:
+                    counts[i] = (nframes - window) // self.hop + 1
+                if calibrated and w._filetype == b'WSIG':
+                    self._zero[i] = w.getzero()
+                    self._factor[i] = w._calibration_factor()
+        # window i belongs to the file searchsorted(_ends, i, 'right')
+        self._ends = np.cumsum(counts)
+        self._firsts = self._ends - counts
+        self._maps = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return int(self._ends[-1]) if len(self._ends) else 0
+
+    def __getitem__(self, i):
+        return self.getbatch([i])[0]
+
+    def locate(self, indices):
+        """Return the file numbers and the first frames of the windows"""
+        indices = np.asarray(indices, np.int64)
+        if len(indices) and (indices.min() < 0 or indices.max() >= len(self)):
+            raise IndexError('window index out of range')
+        files = np.searchsorted(self._ends, indices, 'right')
+        starts = (indices - self._firsts[files]) * self.hop
+        return files, starts
+
+    def getbatch(self, indices):
+        """Return the windows indices as an array of shape
+        (len(indices), window, nchannels)"""
+        files, starts = self.locate(indices)
+        out = np.empty((len(files), self.window, self.nchannels), self.dtype)
+        for j in range(len(files)):
+            start = starts[j]
+            out[j] = self._map(files[j])[start:start + self.window]
+        if self.calibrated:
+            out -= self._zero[files].astype(self.dtype)[:, None, None]
+            out *= self._factor[files].astype(self.dtype)[:, None, None]
+        return out
+
+    def _map(self, i):
+        with self._lock:
+            data = self._maps.get(i)
+            if data is not None:
+                self._maps.move_to_end(i)
+                return data
+        with WsigRead(self.files[i]) as w:
+            data = w.asarray()
+        with self._lock:
+            self._maps[i] = data
+            while len(self._maps) > self.maxopen:
+                self._maps.popitem(last=False)
+        return data
+
+
+class WindowLoader:
+    """Iterate over the batches of a WindowDataset, in a new random order
+    at each iteration (epoch) if shuffle is true.
+
+    The next prefetch batches are built by workers background threads.
+    The last batch is smaller than batchsize unless drop_last is true.
+    """
+
+    def __init__(self, dataset, batchsize, shuffle=True, seed=None, prefetch=2, workers=2,
+                 drop_last=False):
+        if batchsize < 1:
+            raise ValueError('batchsize must be positive')
+        self.dataset = dataset
+        self.batchsize = batchsize
+        self.shuffle = shuffle
+        self.prefetch = max(1, prefetch)
+        self.workers = max(1, workers)
+        self.drop_last = drop_last
+        self._rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        if self.drop_last:
+            return len(self.dataset) // self.batchsize
+        return -(-len(self.dataset) // self.batchsize)
+
+    def __iter__(self):
+        if self.shuffle:
+            order = self._rng.permutation(len(self.dataset))
+        else:
+            order = np.arange(len(self.dataset))
+        batches = [order[i:i + self.batchsize] for i in range(0, len(self) * self.batchsize,
+                                                               self.batchsize)]
+        return self._batches(batches)
+
+    def _batches(self, batches):
+        with concurrent.futures.ThreadPoolExecutor(self.workers,
+                                                   thread_name_prefix='wsig.loader') as executor:
+            pending = collections.deque()
+            try:
+                for indices in batches:
+                    pending.append(executor.submit(self.dataset.getbatch, indices))
+                    if len(pending) > self.prefetch:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
@@ -0,0 +1,103 @@
+"""Streaming rational resampling (import wsig.resample)
+
+    r = wsig.resample.Resampler(2000, 44100, nchannels=1)
+    for block in wave.iterblocks(65536, calibrated=True):
+        out = r.process(block)
+        ...
+    out = r.flush()
+
+The signal is resampled by up / down = outrate / inrate (reduced
+fraction) with a polyphase Kaiser-windowed sinc low-pass filter: only
+the filter phases actually needed are computed, each as one product over
+strided views of the input (no copy of the input windows). The filter
+state (the last input frames) is carried from one block to the next, so
+the output does not depend on how the input is split into blocks. The output is aligned with the
+input (no filter delay) and has ceil(ninput * up / down) frames.
+"""
+
+import math
+
+import numpy as np
+
+__all__ = ["Resampler"]
+
+
+class Resampler:
+    """Resample blocks of shape (frames, nchannels) from inrate to outrate.
+
+    zeros -- number of zero crossings of the sinc on each side of the
+             filter center (quality / speed trade-off)
+    rolloff -- cutoff frequency, relative to the lowest Nyquist frequency
+    beta -- shape parameter of the Kaiser window
+    """
+
+    def __init__(self, inrate, outrate, nchannels=1, zeros=16, rolloff=0.95, beta=8.0,
+                 dtype=np.float32):
+        if inrate <= 0 or outrate <= 0:
+            raise ValueError('rates must be positive')
+        g = math.gcd(int(inrate), int(outrate))
+        self.up = int(outrate) // g
+        self.down = int(inrate) // g
+        self.nchannels = nchannels
+        self.dtype = np.dtype(dtype)
+        up, down = self.up, self.down
+        # taps per phase, enough for the sinc to span 2 * zeros crossings
+        self._taps = 2 * int(math.ceil(zeros * max(up, down) / float(up)))
+        n = up * self._taps
+        cutoff = rolloff * 0.5 / max(up, down)
+        t = np.arange(n) - n // 2
+        h = 2 * cutoff * np.sinc(2 * cutoff * t) * np.kaiser(n + 1, beta)[:n] * up
+        # polyphase filters, reversed to apply to increasing input indices
+        self._phases = h.reshape(self._taps, up).T[:, ::-1].copy()
+        self.reset()
+
+    def reset(self):
+        """Forget the frames already processed"""
+        half = self._taps // 2
+        self._buf = np.zeros((half, self.nchannels))
+        self._bufstart = -half
+        self._nin = 0
+        self._nout = 0
+
+    def process(self, block):
+        """Feed a block of input frames and return the output frames
+        which can already be computed"""
+        block = np.asarray(block).reshape(-1, self.nchannels)
+        self._nin += len(block)
+        return self._process(block)
+
+    def flush(self):
+        """Return the last output frames and reset the resampler"""
+        total = -(-self._nin * self.up // self.down)
+        out = self._process(np.zeros((self._taps, self.nchannels)))
+        out = out[:max(0, total - (self._nout - len(out)))]
+        self.reset()
+        return out
+
+    def _process(self, block):
+        half = self._taps // 2
+        x = np.concatenate([self._buf, block])
+        if len(x) < self._taps:
+            # not even one complete input window: wait for more frames
+            self._buf = x
+            return np.empty((0, self.nchannels), self.dtype)
+        end = self._bufstart + len(x)
+        # last output frame whose input window is complete
+        last = end - 1 - half
+        stop = ((last + 1) * self.up - 1) // self.down + 1 if last >= 0 else 0
+        out = np.empty((max(0, stop - self._nout), self.nchannels), self.dtype)
+        windows = np.lib.stride_tricks.sliding_window_view(x, self._taps, axis=0)
+        # the output frames n, n + up, n + 2 * up, ... use the same phase
+        # and input windows down frames apart: one strided product each
+        for i in range(min(self.up, len(out))):
+            t = (self._nout + i) * self.down
+            first = t // self.up - half + 1 - self._bufstart
+            count = len(range(i, len(out), self.up))
+            out[i::self.up] = windows[first::self.down][:count] @ self._phases[t % self.up]
+        self._nout = max(self._nout, stop)
+        # keep the input frames needed by the next output frames
+        keep = (self._nout * self.down) // self.up - half + 1 - self._bufstart
+        keep = min(max(0, keep), len(x))
+        self._buf = x[keep:]
+        self._bufstart += keep
+        return out
@@ -0,0 +1,141 @@
+"""Signals decoded once into shared memory (import wsig.shm)
+
+    with wsig.shm.share_session('session') as signal:
+        # signal.descriptor is small and cheap to pickle
+        with multiprocessing.Pool(16) as pool:
+            results = pool.map(analyze, [(signal.descriptor, i) for i in ...])
+
+    def analyze(args):
+        descriptor, i = args
+        with wsig.shm.attach(descriptor) as signal:
+            data = signal.array  # no copy, shared by all the workers
+            ...
+
+The owner (share() or share_session()) decodes and calibrates the frames
+block by block directly into a multiprocessing.shared_memory block, and
+unlinks it when it is closed. Workers attach to it by name: the frames
+are neither copied nor pickled. The descriptor holds the name, the shape
+and the dtype of the array and the parameters of the recording.
+"""
+
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from . import Session, read
+
+__all__ = ["share", "share_session", "attach", "SharedSignal"]
+
+_shared_descriptor = namedtuple('_shared_descriptor', 'name shape dtype params')
+
+
+def share(f, calibrated=True, dtype=np.float32, blocksize=1 << 20):
+    """Decode the file f (a file name or an open file) into shared memory
+    and return the owner SharedSignal, of shape (nframes, nchannels).
+    Frames are calibrated into dtype if calibrated is true, otherwise
+    the raw samples are kept. descriptor.params is the getparams() of
+    the file."""
+    with read(f) as w:
+        if not calibrated:
+            dtype = w._dtype()
+        signal = SharedSignal._create((w.getnframes(), w.getnchannels()), dtype, w.getparams())
+        try:
+            array = signal.array
+            pos = 0
+            while pos < len(array):
+                out = array[pos:pos + blocksize]
+                if calibrated:
+                    n = len(w.readcalibrated(-1, out=out))
+                else:
+                    n = w._readinto(out)
+                if not n:
+                    break
+                pos += n
+        except:
+            signal.close()
+            raise
+    return signal
+
+
+def share_session(basename, extensions=None, strict=True, dtype=np.float32, blocksize=1 << 20):
+    """Decode and calibrate the recordings of a Session into shared
+    memory, as one array of shape (nframes, nsignals), and return the
+    owner SharedSignal. descriptor.params is a dict with the files,
+    framerate, nframes, paranames and units of the session."""
+    with Session(basename, extensions, strict) as s:
+        params = dict(files=s.getfiles(), framerate=s.getframerate(), nframes=s.getnframes(),
+                      paranames=s.getparanames(), units=s.getunits())
+        signal = SharedSignal._create((s.getnframes(), s.getnsignals()), dtype, params)
+        try:
+            array = signal.array
+            pos = 0
+            while pos < len(array):
+                n = len(s.readcalibrated(-1, out=array[pos:pos + blocksize]))
+                if not n:
+                    break
+                pos += n
+        except:
+            signal.close()
+            raise
+    return signal
+
+
+def attach(descriptor, writeable=False):
+    """Return a SharedSignal attached to the shared memory described by
+    descriptor (from share() or share_session()), without copy. Its
+    array is read-only unless writeable is true."""
+    try:
+        # the owner unlinks the memory, not the processes attached to it
+        shm = shared_memory.SharedMemory(name=descriptor.name, track=False)
+    except TypeError:
+        # Python < 3.13
+        shm = shared_memory.SharedMemory(name=descriptor.name)
+    signal = SharedSignal(shm, descriptor, owner=False)
+    signal.array.flags.writeable = writeable
+    return signal
+
+
+class SharedSignal:
+    """Array of frames in shared memory.
+
+    array -- numpy array over the shared memory
+    descriptor -- (name, shape, dtype, params), to give to attach()
+
+    close() releases the memory of this process (array must not be used
+    any more); the owner also unlinks it, so that it is freed once every
+    process attached to it has closed it.
+    """
+
+    def __init__(self, shm, descriptor, owner):
+        self._shm = shm
+        self._owner = owner
+        self.descriptor = descriptor
+        self.array = np.ndarray(descriptor.shape, np.dtype(descriptor.dtype), buffer=shm.buf)
+
+    @classmethod
+    def _create(cls, shape, dtype, params):
+        dtype = np.dtype(dtype)
+        # shared memory blocks cannot be empty
+        size = max(1, int(np.prod(shape)) * dtype.itemsize)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        return cls(shm, _shared_descriptor(shm.name, shape, dtype.str, params), owner=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        shm = self._shm
+        if shm is None:
+            return
+        self._shm = None
+        self.array = None
+        shm.close()
+        if self._owner:
+            shm.unlink()
@@ -0,0 +1,120 @@
+"""Streaming spectrograms (import wsig.spectrogram)
+
+    times, freqs, S = wsig.spectrogram.spectrogram('session.int', nperseg=512)
+    levels = wsig.spectrogram.pyramid(S)  # for plotting long recordings
+
+The file is read by blocks of whole segments; the overlapping segments
+of a block are strided views of it (no copy), windowed and transformed
+together by one numpy.fft.rfft call. The power spectra are written to
+an array, or to a .npy file mapped in memory, so that the memory used
+does not depend on the duration of the recording.
+"""
+
+import numpy as np
+
+from . import read
+
+__all__ = ["spectrogram", "pyramid"]
+
+
+def _window(window, nperseg):
+    if isinstance(window, str):
+        if window == 'hann':
+            # periodic Hann window
+            return np.hanning(nperseg + 1)[:-1]
+        if window in ('boxcar', 'rectangular'):
+            return np.ones(nperseg)
+        raise ValueError('unknown window: %r' % window)
+    window = np.asarray(window, np.float64)
+    if window.shape != (nperseg,):
+        raise ValueError('window must have nperseg values')
+    return window
+
+
+def spectrogram(f, nperseg=256, noverlap=None, window='hann', scaling='density', channel=0,
+                calibrated=True, out=None, dtype=np.float32, blocksegments=1024):
+    """Return (times, freqs, S), the spectrogram of the channel channel of
+    the file f (a file name or an open file).
+
+    nperseg -- length of the segments, in frames
+    noverlap -- number of frames shared by consecutive segments
+                (default nperseg // 2)
+    window -- 'hann', 'boxcar' or an array of nperseg values
+    scaling -- 'density' (power spectral density, in unit**2/Hz) or
+               'spectrum' (power spectrum, in unit**2), one-sided
+    out -- None (a new array), an array of shape (segments, frequencies)
+           or the name of a .npy file created and mapped in memory
+    blocksegments -- number of segments transformed at a time
+
+    times holds the time of the center of each segment, S has one row
+    (power spectrum) per segment. The segments are not detrended.
+    """
+    if noverlap is None:
+        noverlap = nperseg // 2
+    if not 0 <= noverlap < nperseg:
+        raise ValueError('noverlap must be in [0, nperseg)')
+    if scaling not in ('density', 'spectrum'):
+        raise ValueError("scaling must be 'density' or 'spectrum'")
+    win = _window(window, nperseg)
+    hop = nperseg - noverlap
+    with read(f) as w:
+        framerate = w.getframerate()
+        nframes = w.getnframes()
+        nsegments = (nframes - nperseg) // hop + 1 if nframes >= nperseg else 0
+        nfreqs = nperseg // 2 + 1
+        shape = (nsegments, nfreqs)
+        if out is None:
+            out = np.empty(shape, dtype)
+        elif isinstance(out, str):
+            out = np.lib.format.open_memmap(out, 'w+', np.dtype(dtype), shape)
+        elif out.shape != shape:
+            raise ValueError('out must have shape %r' % (shape,))
+        if scaling == 'density':
+            scale = 1.0 / (framerate * (win ** 2).sum())
+        else:
+            scale = 1.0 / win.sum() ** 2
+        # one-sided spectrum: the power of the negative frequencies is
+        # added to the positive ones
+        scales = np.full(nfreqs, 2 * scale)
+        scales[0] = scale
+        if nperseg % 2 == 0:
+            scales[-1] = scale
+        # consecutive blocks share noverlap frames: each block holds
+        # blocksegments whole segments
+        blocksize = nperseg + (blocksegments - 1) * hop
+        i = 0
+        for block in w.iterblocks(blocksize, noverlap, calibrated, np.float64):
+            if len(block) < nperseg:
+                break
+            segments = np.lib.stride_tricks.sliding_window_view(block[:, channel], nperseg)[::hop]
+            spectrum = np.fft.rfft(segments * win, axis=1)
+            power = spectrum.real ** 2
+            power += spectrum.imag ** 2
+            power *= scales
+            out[i:i + len(power)] = power
+            i += len(power)
+    times = (np.arange(nsegments) * hop + nperseg / 2.0) / framerate
+    freqs = np.fft.rfftfreq(nperseg, 1.0 / framerate)
+    return times, freqs, out
+
+
+def pyramid(S, factor=4, minsize=1024, blocksize=1 << 16):
+    """Return the list of the levels of a decimated spectrogram: level 0
+    is S, each row of level k + 1 is the mean of factor rows of level k,
+    up to a level of at most minsize rows. S may be a memmap: it is read
+    by blocks of blocksize rows."""
+    if factor < 2:
+        raise ValueError('factor must be >= 2')
+    levels = [S]
+    while len(levels[-1]) > minsize:
+        previous = levels[-1]
+        level = np.empty((-(-len(previous) // factor),) + previous.shape[1:], previous.dtype)
+        step = blocksize * factor
+        for start in range(0, len(previous), step):
+            block = np.asarray(previous[start:start + step], np.float64)
+            bins = np.arange(0, len(block), factor)
+            counts = np.diff(np.append(bins, len(block)))
+            level[start // factor:start // factor + len(bins)] = \
+                np.add.reduceat(block, bins, axis=0) / counts[:, None]
+        levels.append(level)
+    return levels
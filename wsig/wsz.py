@@ -0,0 +1,319 @@
+"""Compressed archive of SESANE or WAVE files (.wsz) with random access
+(import wsig.wsz)
+
+    wsig.wsz.compress('session.pr1', 'session.pr1.wsz')
+    with wsig.wsz.open('session.pr1.wsz') as f:
+        excerpt = f.read_time_range(60.0, 61.5, calibrated=True)
+    wsig.wsz.decompress('session.pr1.wsz', 'copy.pr1')
+
+The frames are stored in blocks of blocksize frames, each compressed on
+its own with zlib or lzma, so that reading a time range decompresses
+only the blocks which overlap it. Before compression each block is
+delta encoded along time (lossless, with the wrap-around of integer
+arithmetic; float samples are delta encoded as integers of the same
+width) and its bytes are shuffled by significance, which makes slow
+physiological signals compress several-fold.
+
+Layout of a .wsz file (little-endian):
+    magic       4s  b'WSZ1'
+    codec       B   0: zlib, 1: lzma
+    filters     B   bit 0: delta, bit 1: byte shuffle
+    reserved    H
+    blocksize   I   frames per block
+    nframes     Q
+    headersize  I
+    indexoffset Q
+    header      the original file up to the samples (RIFF header, fmt/sdsc/
+                adsc/LIST chunks and data chunk header), verbatim
+    blocks      the compressed blocks
+    index       (offset Q, size I) of each block
+    trailer     the original bytes after the frames (pad byte, chunks
+                after data), verbatim
+"""
+
+import builtins
+import io
+import lzma
+import struct
+import threading
+import zlib
+
+import numpy as np
+
+from . import Error, WsigRead, _pack24
+
+__all__ = ["compress", "decompress", "open", "WszRead"]
+
+_MAGIC = b'WSZ1'
+_HEADER = struct.Struct('<4sBBHIQIQ')
+_INDEX = struct.Struct('<QI')
+_CODECS = ('zlib', 'lzma')
+_DELTA = 1
+_SHUFFLE = 2
+
+
+def _intview(dtype):
+    # float samples are delta encoded as the integers of the same bytes,
+    # so that the wrap-around of integer arithmetic keeps it lossless
+    return np.dtype(dtype.str.replace('f', 'i'))
+
+
+def _encode(block, filters, codec, level):
+    data = block
+    if filters & _DELTA:
+        block = block.view(_intview(block.dtype))
+        data = np.empty_like(block)
+        data[:1] = block[:1]
+        np.subtract(block[1:], block[:-1], out=data[1:])
+    data = data.reshape(-1).view(np.uint8)
+    if filters & _SHUFFLE:
+        data = data.reshape(-1, block.dtype.itemsize).T
+    data = np.ascontiguousarray(data).data
+    if codec == 0:
+        return zlib.compress(data, 6 if level is None else level)
+    return lzma.compress(data, preset=6 if level is None else level)
+
+
+def _decode(data, filters, codec, dtype, nchannels):
+    if codec == 0:
+        data = zlib.decompress(data)
+    else:
+        data = lzma.decompress(data)
+    data = np.frombuffer(data, np.uint8)
+    if filters & _SHUFFLE:
+        data = data.reshape(dtype.itemsize, -1).T.copy()
+    if filters & _DELTA:
+        block = data.view(_intview(dtype)).reshape(-1, nchannels)
+        return np.cumsum(block, axis=0, dtype=block.dtype).view(dtype)
+    return data.view(dtype).reshape(-1, nchannels)
+
+
+def compress(src, dst, blocksize=65536, codec='zlib', level=None, delta=True, shuffle=True):
+    """Compress the SESANE or WAVE file src (a file name) into the .wsz
+    file dst (a file name or an open file object).
+
+    blocksize -- number of frames per compressed block; smaller blocks
+                 make short excerpt reads cheaper, larger blocks compress
+                 slightly better
+    codec -- 'zlib' or 'lzma', compression level (default 6)
+    delta, shuffle -- filters applied to each block before compression
+    """
+    if codec not in _CODECS:
+        raise ValueError('codec must be one of %r' % (_CODECS,))
+    if blocksize <= 0:
+        raise ValueError('blocksize must be positive')
+    codec = _CODECS.index(codec)
+    filters = (_DELTA if delta else 0) | (_SHUFFLE if shuffle else 0)
+    with WsigRead(src) as w, builtins.open(src, 'rb') as raw:
+        header = raw.read(w._data_offset)
+        dtype = w._dtype().newbyteorder('<')
+        nframes = w.getnframes()
+        if hasattr(dst, 'write'):
+            out = dst
+        else:
+            out = builtins.open(dst, 'wb')
+        try:
+            start = out.tell()
+            out.write(_HEADER.pack(_MAGIC, codec, filters, 0, blocksize, nframes, len(header), 0))
+            out.write(header)
+            index = []
+            for block in w.iterblocks(blocksize):
+                data = _encode(block.astype(dtype, copy=False), filters, codec, level)
+                index.append(_INDEX.pack(out.tell() - start, len(data)))
+                out.write(data)
+            indexoffset = out.tell() - start
+            out.write(b''.join(index))
+            raw.seek(w._data_offset + nframes * w._framesize)
+            out.write(raw.read())
+            end = out.tell()
+            out.seek(start)
+            out.write(_HEADER.pack(_MAGIC, codec, filters, 0, blocksize, nframes, len(header),
+                                   indexoffset))
+            out.seek(end)
+        finally:
+            if out is not dst:
+                out.close()
+
+
+def decompress(src, dst):
+    """Restore the original file, byte for byte, from the .wsz file src
+    into dst (a file name or an open file object)"""
+    with WszRead(src) as z:
+        if hasattr(dst, 'write'):
+            out = dst
+        else:
+            out = builtins.open(dst, 'wb')
+        try:
+            out.write(z._header)
+            for i in range(len(z._index)):
+                if z._info.getsampwith() == 3:
+                    out.write(_pack24(z._block(i)))
+                else:
+                    out.write(z._block(i).astype(z._dtype.newbyteorder('<'), copy=False).data)
+            out.write(z._trailer())
+        finally:
+            if out is not dst:
+                out.close()
+
+
+def open(f):
+    """Return a WszRead for f, the name of a .wsz file or an open file object"""
+    return WszRead(f)
+
+
+class WszRead:
+    """Random access reader of a .wsz file.
+
+    The header information is available through the same get*() methods
+    as WsigRead (getparams(), getframerate(), getparaname(), ...).
+    read_range() and read_time_range() decompress only the blocks which
+    overlap the requested range; the last decompressed block is kept so
+    that successive short reads do not decompress it again. A WszRead can
+    be shared between threads.
+    """
+
+    def __init__(self, f):
+        self._i_opened_the_file = None
+        if isinstance(f, str):
+            f = builtins.open(f, 'rb')
+            self._i_opened_the_file = f
+        try:
+            self._initfp(f)
+        except:
+            if self._i_opened_the_file:
+                f.close()
+            raise
+
+    def _initfp(self, f):
+        self._file = f
+        self._start = f.tell()
+        try:
+            (magic, self._codec, self._filters, reserved, self._blocksize, self._nframes,
+             headersize, indexoffset) = _HEADER.unpack(f.read(_HEADER.size))
+        except struct.error:
+            raise EOFError from None
+        if magic != _MAGIC:
+            raise Error('not a wsz file')
+        if self._codec >= len(_CODECS):
+            raise Error('unknown codec: %r' % self._codec)
+        self._header = f.read(headersize)
+        # the original header gives the parameters of the signal
+        self._info = WsigRead(io.BytesIO(self._header))
+        self._dtype = self._info._dtype()
+        self._nchannels = self._info.getnchannels()
+        nblocks = -(-self._nframes // self._blocksize)
+        f.seek(self._start + indexoffset)
+        index = f.read(nblocks * _INDEX.size)
+        if len(index) != nblocks * _INDEX.size:
+            raise EOFError
+        self._index = [_INDEX.unpack_from(index, i * _INDEX.size) for i in range(nblocks)]
+        self._traileroffset = indexoffset + len(index)
+        self._cache = (None, None)
+        self._lock = threading.Lock()
+
+    def __del__(self):
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __getattr__(self, name):
+        if name.startswith('get') and name != 'getfp':
+            return getattr(self._info, name)
+        raise AttributeError(name)
+
+    def close(self):
+        self._file = None
+        file = self._i_opened_the_file
+        if file:
+            self._i_opened_the_file = None
+            file.close()
+
+    def getnframes(self):
+        return self._nframes
+
+    def getblocksize(self):
+        return self._blocksize
+
+    def getlistdata(self):
+        """Return the body of the LIST chunk (bytes), or None. A LIST chunk
+        after the data chunk (as written by EVA) is read from the trailer
+        on first call."""
+        info = self._info
+        if info._list_data is None and not info._list_searched:
+            info._list_searched = 1
+            info._list_data = self._read_trailing_list()
+        return info._list_data
+
+    def getmetainfo(self):
+        self.getlistdata()
+        return self._info.getmetainfo()
+
+    def read_range(self, start, stop, calibrated=False, dtype=np.float32):
+        """Return the frames [start, stop) as an array of shape
+        (frames, nchannels), calibrated into dtype if calibrated is true
+        (WAVE files are only converted to dtype). The range is clipped to
+        the signal like a slice."""
+        start = min(max(0, start), self._nframes)
+        stop = min(max(start, stop), self._nframes)
+        out = np.empty((stop - start, self._nchannels), dtype if calibrated else self._dtype)
+        pos = start
+        while pos < stop:
+            i, offset = divmod(pos, self._blocksize)
+            block = self._block(i)[offset:offset + stop - pos]
+            out[pos - start:pos - start + len(block)] = block
+            pos += len(block)
+        if calibrated and self._info._filetype == b'WSIG':
+            out -= self._info.getzero()
+            out *= self._info._calibration_factor()
+        return out
+
+    def read_time_range(self, t0, t1, calibrated=False, dtype=np.float32):
+        """Same as read_range(), with the range [t0, t1) in seconds."""
+        framerate = self._info.getframerate()
+        return self.read_range(int(round(t0 * framerate)), int(round(t1 * framerate)),
+                               calibrated, dtype)
+
+    def _read(self, offset, size):
+        with self._lock:
+            self._file.seek(self._start + offset)
+            data = self._file.read(size)
+        if len(data) != size:
+            raise EOFError
+        return data
+
+    def _block(self, i):
+        cached, block = self._cache
+        if cached == i:
+            return block
+        offset, size = self._index[i]
+        block = _decode(self._read(offset, size), self._filters, self._codec,
+                        self._dtype.newbyteorder('<'), self._nchannels)
+        block = block.astype(self._dtype, copy=False)
+        self._cache = (i, block)
+        return block
+
+    def _read_trailing_list(self):
+        # Look for a LIST chunk in the original bytes after the frames, as
+        # WsigRead._read_trailing_list()
+        info = self._info
+        if info._filetype != b'WSIG':
+            return None
+        trailer = self._trailer()
+        # rest of the data chunk and pad byte
+        pos = info._data_size - self._nframes * info._framesize + (info._data_size & 1)
+        while pos + 8 <= len(trailer):
+            chunkname, chunksize = struct.unpack_from('<4sL', trailer, pos)
+            if chunkname == b'LIST':
+                data = trailer[pos + 8:pos + 8 + chunksize]
+                return data if len(data) == chunksize else None
+            pos += 8 + chunksize + (chunksize & 1)
+        return None
+
+    def _trailer(self):
+        with self._lock:
+            self._file.seek(self._start + self._traileroffset)
+            return self._file.read()